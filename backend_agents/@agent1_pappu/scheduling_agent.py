@@ -118,6 +118,48 @@ async def handle_meeting_request(ctx: Context, sender: str, msg: MeetingRequest)
         
         await ctx.send(sender, error_response)
 
+async def respond_to_proposal(ctx: Context, msg, accepted: str, countered: str, rejected: str) -> AgentResponse:
+    """
+    Evaluate a proposed time and accept it or answer with a counter-proposal,
+    replying with the accepted, countered or rejected message
+    """
+    # Evaluate the proposal
+    evaluation = await decision_engine.evaluate_time_proposal(ctx, msg)
+    
+    ctx.logger.info(f"Proposal evaluation: Acceptable = {evaluation['acceptable']}")
+    
+    if evaluation['acceptable']:
+        # Accept the proposal
+        return AgentResponse(
+            success=True,
+            message=accepted,
+            data={"evaluation": evaluation},
+            reasoning=evaluation['reasoning']
+        )
+    
+    # Generate counter-proposal
+    counter_proposal = await decision_engine.generate_counter_proposal(ctx, msg)
+    
+    if counter_proposal:
+        ctx.logger.info(f"🔄 Generated counter-proposal: {counter_proposal.proposed_time}")
+        
+        return AgentResponse(
+            success=False,
+            message=countered,
+            data={
+                "evaluation": evaluation,
+                "counter_proposal": counter_proposal.dict()
+            },
+            reasoning=evaluation['reasoning']
+        )
+    
+    return AgentResponse(
+        success=False,
+        message=rejected,
+        data={"evaluation": evaluation},
+        reasoning=evaluation['reasoning']
+    )
+
 @agent.on_message(model=NegotiationMessage)
 async def handle_negotiation_message(ctx: Context, sender: str, msg: NegotiationMessage):
     """
@@ -130,42 +172,12 @@ async def handle_negotiation_message(ctx: Context, sender: str, msg: Negotiation
     
     try:
         if msg.message_type == MessageType.PROPOSAL:
-            # Evaluate the proposal
-            evaluation = await decision_engine.evaluate_time_proposal(ctx, msg)
-            
-            ctx.logger.info(f"Proposal evaluation: Acceptable = {evaluation['acceptable']}")
-            
-            if evaluation['acceptable']:
-                # Accept the proposal
-                response = AgentResponse(
-                    success=True,
-                    message="✅ Proposal accepted!",
-                    data={"evaluation": evaluation},
-                    reasoning=evaluation['reasoning']
-                )
-            else:
-                # Generate counter-proposal
-                counter_proposal = await decision_engine.generate_counter_proposal(ctx, msg)
-                
-                if counter_proposal:
-                    ctx.logger.info(f"🔄 Generated counter-proposal: {counter_proposal.proposed_time}")
-                    
-                    response = AgentResponse(
-                        success=False,
-                        message="❌ Proposal rejected, but here's a counter-proposal",
-                        data={
-                            "evaluation": evaluation,
-                            "counter_proposal": counter_proposal.dict()
-                        },
-                        reasoning=evaluation['reasoning']
-                    )
-                else:
-                    response = AgentResponse(
-                        success=False,
-                        message="❌ Proposal rejected, no alternatives available",
-                        data={"evaluation": evaluation},
-                        reasoning=evaluation['reasoning']
-                    )
+            response = await respond_to_proposal(
+                ctx, msg,
+                accepted="✅ Proposal accepted!",
+                countered="❌ Proposal rejected, but here's a counter-proposal",
+                rejected="❌ Proposal rejected, no alternatives available"
+            )
         
         elif msg.message_type == MessageType.ACCEPTANCE:
             response = AgentResponse(
@@ -224,41 +236,12 @@ async def handle_time_proposal(ctx: Context, sender: str, msg: TimeProposal):
     ctx.logger.info(f"Reasoning: {msg.reasoning}")
     
     try:
-        # Evaluate the proposal
-        evaluation = await decision_engine.evaluate_time_proposal(ctx, msg)
-        
-        ctx.logger.info(f"Proposal evaluation: Acceptable = {evaluation['acceptable']}")
-        
-        if evaluation['acceptable']:
-            response = AgentResponse(
-                success=True,
-                message="✅ Time proposal accepted!",
-                data={"evaluation": evaluation},
-                reasoning=evaluation['reasoning']
-            )
-        else:
-            # Generate counter-proposal
-            counter_proposal = await decision_engine.generate_counter_proposal(ctx, msg)
-            
-            if counter_proposal:
-                ctx.logger.info(f"🔄 Generated counter-proposal: {counter_proposal.proposed_time}")
-                
-                response = AgentResponse(
-                    success=False,
-                    message="❌ Time proposal rejected, here's a counter-proposal",
-                    data={
-                        "evaluation": evaluation,
-                        "counter_proposal": counter_proposal.dict()
-                    },
-                    reasoning=evaluation['reasoning']
-                )
-            else:
-                response = AgentResponse(
-                    success=False,
-                    message="❌ Time proposal rejected, no alternatives available",
-                    data={"evaluation": evaluation},
-                    reasoning=evaluation['reasoning']
-                )
+        response = await respond_to_proposal(
+            ctx, msg,
+            accepted="✅ Time proposal accepted!",
+            countered="❌ Time proposal rejected, here's a counter-proposal",
+            rejected="❌ Time proposal rejected, no alternatives available"
+        )
         
         # Send response back
         await ctx.send(sender, response)
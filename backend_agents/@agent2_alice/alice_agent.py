@@ -121,6 +121,52 @@ async def handle_meeting_request(ctx: Context, sender: str, msg: MeetingRequest)
         
         await ctx.send(sender, error_response)
 
+async def respond_to_proposal(ctx: Context, msg, accepted: str, countered: str, rejected: str,
+                              log_counter_reasoning: bool = False) -> AgentResponse:
+    """
+    Evaluate a proposed time against Alice's schedule and accept it or counter it,
+    replying with the accepted, countered or rejected message
+    """
+    # Evaluate the proposal using real schedule data
+    evaluation = await decision_engine.evaluate_time_proposal(ctx, msg)
+    
+    ctx.logger.info(f"Proposal evaluation: Acceptable = {evaluation['acceptable']}")
+    ctx.logger.info(f"Evaluation reasoning: {evaluation['reasoning']}")
+    
+    if evaluation['acceptable']:
+        # Accept the proposal
+        return AgentResponse(
+            success=True,
+            message=accepted,
+            data={"evaluation": evaluation},
+            reasoning=evaluation['reasoning']
+        )
+    
+    # Generate counter-proposal using real schedule
+    counter_proposal = await decision_engine.generate_counter_proposal(ctx, msg)
+    
+    if counter_proposal:
+        ctx.logger.info(f"🔄 Alice generated counter-proposal: {counter_proposal.proposed_time}")
+        if log_counter_reasoning:
+            ctx.logger.info(f"Counter-proposal reasoning: {counter_proposal.reasoning}")
+        
+        return AgentResponse(
+            success=False,
+            message=countered,
+            data={
+                "evaluation": evaluation,
+                "counter_proposal": counter_proposal.dict()
+            },
+            reasoning=evaluation['reasoning']
+        )
+    
+    return AgentResponse(
+        success=False,
+        message=rejected,
+        data={"evaluation": evaluation},
+        reasoning=evaluation['reasoning']
+    )
+
 @alice_agent.on_message(model=NegotiationMessage)
 async def handle_negotiation_message(ctx: Context, sender: str, msg: NegotiationMessage):
     """
@@ -133,44 +179,13 @@ async def handle_negotiation_message(ctx: Context, sender: str, msg: Negotiation
     
     try:
         if msg.message_type == MessageType.PROPOSAL:
-            # Evaluate the proposal using real schedule data
-            evaluation = await decision_engine.evaluate_time_proposal(ctx, msg)
-            
-            ctx.logger.info(f"Proposal evaluation: Acceptable = {evaluation['acceptable']}")
-            ctx.logger.info(f"Evaluation reasoning: {evaluation['reasoning']}")
-            
-            if evaluation['acceptable']:
-                # Accept the proposal
-                response = AgentResponse(
-                    success=True,
-                    message="✅ Alice accepts the proposal!",
-                    data={"evaluation": evaluation},
-                    reasoning=evaluation['reasoning']
-                )
-            else:
-                # Generate counter-proposal using real schedule
-                counter_proposal = await decision_engine.generate_counter_proposal(ctx, msg)
-                
-                if counter_proposal:
-                    ctx.logger.info(f"🔄 Alice generated counter-proposal: {counter_proposal.proposed_time}")
-                    ctx.logger.info(f"Counter-proposal reasoning: {counter_proposal.reasoning}")
-                    
-                    response = AgentResponse(
-                        success=False,
-                        message="❌ Alice rejects proposal, but here's a counter-proposal",
-                        data={
-                            "evaluation": evaluation,
-                            "counter_proposal": counter_proposal.dict()
-                        },
-                        reasoning=evaluation['reasoning']
-                    )
-                else:
-                    response = AgentResponse(
-                        success=False,
-                        message="❌ Alice rejects proposal, no alternatives available",
-                        data={"evaluation": evaluation},
-                        reasoning=evaluation['reasoning']
-                    )
+            response = await respond_to_proposal(
+                ctx, msg,
+                accepted="✅ Alice accepts the proposal!",
+                countered="❌ Alice rejects proposal, but here's a counter-proposal",
+                rejected="❌ Alice rejects proposal, no alternatives available",
+                log_counter_reasoning=True
+            )
         
         elif msg.message_type == MessageType.ACCEPTANCE:
             response = AgentResponse(
@@ -229,42 +244,12 @@ async def handle_time_proposal(ctx: Context, sender: str, msg: TimeProposal):
     ctx.logger.info(f"Reasoning: {msg.reasoning}")
     
     try:
-        # Evaluate the proposal using real schedule data
-        evaluation = await decision_engine.evaluate_time_proposal(ctx, msg)
-        
-        ctx.logger.info(f"Proposal evaluation: Acceptable = {evaluation['acceptable']}")
-        ctx.logger.info(f"Evaluation reasoning: {evaluation['reasoning']}")
-        
-        if evaluation['acceptable']:
-            response = AgentResponse(
-                success=True,
-                message="✅ Alice accepts the time proposal!",
-                data={"evaluation": evaluation},
-                reasoning=evaluation['reasoning']
-            )
-        else:
-            # Generate counter-proposal using real schedule
-            counter_proposal = await decision_engine.generate_counter_proposal(ctx, msg)
-            
-            if counter_proposal:
-                ctx.logger.info(f"🔄 Alice generated counter-proposal: {counter_proposal.proposed_time}")
-                
-                response = AgentResponse(
-                    success=False,
-                    message="❌ Alice rejects time proposal, here's a counter-proposal",
-                    data={
-                        "evaluation": evaluation,
-                        "counter_proposal": counter_proposal.dict()
-                    },
-                    reasoning=evaluation['reasoning']
-                )
-            else:
-                response = AgentResponse(
-                    success=False,
-                    message="❌ Alice rejects time proposal, no alternatives available",
-                    data={"evaluation": evaluation},
-                    reasoning=evaluation['reasoning']
-                )
+        response = await respond_to_proposal(
+            ctx, msg,
+            accepted="✅ Alice accepts the time proposal!",
+            countered="❌ Alice rejects time proposal, here's a counter-proposal",
+            rejected="❌ Alice rejects time proposal, no alternatives available"
+        )
         
         # Send response back
         await ctx.send(sender, response)
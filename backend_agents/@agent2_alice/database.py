@@ -3,27 +3,44 @@ Database connection and operations for the scheduling system
 """
 import asyncio
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import json
 import os
+import uuid
 
 class DatabaseManager:
     """Manages database connections and operations"""
     
     def __init__(self):
         self.connection = None
+        # sqlite3 calls block, so they run on one dedicated worker thread instead of the event loop
+        self._executor: Optional[ThreadPoolExecutor] = None
         # Use SQLite database with configurable path
         # Default to project root, but allow override via environment variable
         script_dir = os.path.dirname(os.path.abspath(__file__))
         project_root = os.path.dirname(os.path.dirname(script_dir))  # Go up two levels from @agent2_alice
         self.database_path = os.getenv("DATABASE_PATH", os.path.join(project_root, "agentschedule.db"))
     
+    async def _run(self, func, *args):
+        """Run a blocking sqlite3 call on the connection's worker thread"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
     async def connect(self):
         """Connect to the database"""
+        if self.connection is not None:
+            # Every service shares this one connection; don't open another
+            return
         try:
             if os.path.exists(self.database_path):
-                self.connection = sqlite3.connect(self.database_path)
+                # Only ever used from the worker thread, one call at a time
+                self.connection = await self._run(
+                    partial(sqlite3.connect, self.database_path, check_same_thread=False)
+                )
                 print("✅ Connected to SQLite database")
             else:
                 print(f"❌ Database file not found: {self.database_path}")
@@ -35,37 +52,100 @@ class DatabaseManager:
     async def disconnect(self):
         """Disconnect from the database"""
         if self.connection:
-            self.connection.close()
+            await self._run(self.connection.close)
+            # Let the next connect() open a fresh connection
+            self.connection = None
             print("✅ Disconnected from database")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
     
-    async def execute_query(self, query: str, *args) -> List[Dict[str, Any]]:
-        """Execute a query and return results"""
+    async def execute_query(self, query: str, *args, raise_errors: bool = False) -> List[Dict[str, Any]]:
+        """Execute a query and return results (with raise_errors, failures raise instead of returning [])"""
         if not self.connection:
+            if raise_errors:
+                raise ConnectionError("Not connected to the database")
             return []
         
-        try:
+        def run():
             cursor = self.connection.cursor()
             cursor.execute(query, args)
             columns = [description[0] for description in cursor.description]
             rows = cursor.fetchall()
             return [dict(zip(columns, row)) for row in rows]
+        
+        try:
+            return await self._run(run)
         except Exception as e:
             print(f"❌ Query execution failed: {e}")
+            if raise_errors:
+                raise
             return []
     
+    async def iter_query(self, query: str, *args, batch_size: int = 256, raise_errors: bool = False):
+        """Execute a query and yield rows one at a time, fetching them from the cursor in batches
+        
+        With raise_errors, a missing connection or a failed query raises instead of yielding nothing,
+        so callers that cache the rows can tell a failure from an empty result.
+        """
+        if not self.connection:
+            if raise_errors:
+                raise ConnectionError("Not connected to the database")
+            return
+        
+        def start():
+            cursor = self.connection.cursor()
+            cursor.execute(query, args)
+            return cursor, [description[0] for description in cursor.description]
+        
+        try:
+            cursor, columns = await self._run(start)
+            while True:
+                rows = await self._run(cursor.fetchmany, batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(columns, row))
+        except Exception as e:
+            print(f"❌ Query execution failed: {e}")
+            if raise_errors:
+                raise
+    
     async def execute_command(self, command: str, *args) -> bool:
         """Execute a command (INSERT, UPDATE, DELETE)"""
         if not self.connection:
             return False
         
-        try:
+        def run():
             cursor = self.connection.cursor()
             cursor.execute(command, args)
             self.connection.commit()
+        
+        try:
+            await self._run(run)
             return True
         except Exception as e:
             print(f"❌ Command execution failed: {e}")
             return False
+    
+    async def execute_batch(self, statements: List[tuple]) -> bool:
+        """Execute (command, rows) pairs with executemany and a single commit"""
+        if not self.connection:
+            return False
+        
+        def run():
+            cursor = self.connection.cursor()
+            for command, rows in statements:
+                cursor.executemany(command, rows)
+            self.connection.commit()
+        
+        try:
+            await self._run(run)
+            return True
+        except Exception as e:
+            print(f"❌ Batch execution failed: {e}")
+            await self._run(self.connection.rollback)
+            return False
 
 class CalendarService:
     """Service for managing calendar data"""
@@ -73,7 +153,7 @@ class CalendarService:
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
     
-    async def get_user_calendar_blocks(self, user_id: str) -> List[Dict[str, Any]]:
+    async def get_user_calendar_blocks(self, user_id: str, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """Get calendar blocks for a user"""
         query = """
         SELECT id, title, start_time, end_time, block_type, priority, is_moveable
@@ -81,17 +161,18 @@ class CalendarService:
         WHERE user_id = ?
         ORDER BY start_time
         """
-        return await self.db.execute_query(query, user_id)
+        return await self.db.execute_query(query, user_id, raise_errors=raise_errors)
     
     async def add_calendar_block(self, user_id: str, title: str, start_time: datetime, 
                                end_time: datetime, block_type: str, priority: int = 5, 
                                is_moveable: bool = False) -> bool:
         """Add a new calendar block"""
+        block_id = uuid.uuid4().hex
         command = """
-        INSERT INTO calendar_blocks (user_id, title, start_time, end_time, block_type, priority, is_moveable)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO calendar_blocks (id, user_id, title, start_time, end_time, block_type, priority, is_moveable)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """
-        return await self.db.execute_command(command, user_id, title, start_time, end_time, block_type, priority, is_moveable)
+        return await self.db.execute_command(command, block_id, user_id, title, start_time, end_time, block_type, priority, is_moveable)
     
     async def check_time_conflict(self, user_id: str, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
         """Check for conflicts in a time range"""
@@ -105,6 +186,19 @@ class CalendarService:
         """
         return await self.db.execute_query(query, user_id, end_time, start_time)
     
+    async def iter_blocks_in_range(self, user_id: str, start_time: datetime, end_time: datetime):
+        """Stream a user's blocks overlapping a time range, ordered by start time; raises if the query fails"""
+        query = """
+        SELECT id, title, start_time, end_time, block_type, priority, is_moveable
+        FROM calendar_blocks 
+        WHERE user_id = ? 
+        AND start_time < ? 
+        AND end_time > ?
+        ORDER BY start_time
+        """
+        async for row in self.db.iter_query(query, user_id, end_time, start_time, raise_errors=True):
+            yield row
+    
     async def find_available_times(self, user_id: str, duration_minutes: int, 
                                  start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
         """Find available time slots"""
@@ -140,8 +234,7 @@ class MeetingService:
                                    duration_minutes: int, preferred_start_time: datetime = None,
                                    preferred_end_time: datetime = None, priority_level: int = 5) -> str:
         """Create a new meeting request"""
-        import uuid
-        meeting_id = str(uuid.uuid4())
+        meeting_id = uuid.uuid4().hex
         command = """
         INSERT INTO meeting_requests (id, initiator_id, title, description, duration_minutes, 
                                     preferred_start_time, preferred_end_time, priority_level)
@@ -155,8 +248,7 @@ class MeetingService:
     async def add_meeting_participant(self, meeting_request_id: str, user_id: str, 
                                     agent_address: str, is_required: bool = True) -> bool:
         """Add a participant to a meeting request"""
-        import uuid
-        participant_id = str(uuid.uuid4())
+        participant_id = uuid.uuid4().hex
         command = """
         INSERT INTO meeting_participants (id, meeting_request_id, user_id, agent_address, is_required)
         VALUES (?, ?, ?, ?, ?)
@@ -187,6 +279,37 @@ class MeetingService:
         """
         return await self.db.execute_command(command, status, final_scheduled_time, meeting_id)
 
+    async def schedule_meeting(self, initiator_id: str, title: str, description: str,
+                               start_time: datetime, end_time: datetime, participants: List[tuple],
+                               priority_level: int = 5, block_priority: int = 8) -> Optional[str]:
+        """Create a scheduled meeting, its participants and their calendar blocks in one batch
+        
+        participants is a list of (user_id, agent_address) pairs.
+        """
+        meeting_id = uuid.uuid4().hex
+        duration_minutes = int((end_time - start_time).total_seconds() // 60)
+        statements = [
+            ("""
+            INSERT INTO meeting_requests (id, initiator_id, title, description, duration_minutes, 
+                                        preferred_start_time, preferred_end_time, priority_level,
+                                        status, final_scheduled_time)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'scheduled', ?)
+            """, [(meeting_id, initiator_id, title, description, duration_minutes,
+                   start_time, end_time, priority_level, start_time)]),
+            ("""
+            INSERT INTO meeting_participants (id, meeting_request_id, user_id, agent_address, is_required)
+            VALUES (?, ?, ?, ?, 1)
+            """, [(uuid.uuid4().hex, meeting_id, user_id, agent_address)
+                  for user_id, agent_address in participants]),
+            ("""
+            INSERT INTO calendar_blocks (id, user_id, title, start_time, end_time, block_type, priority, is_moveable)
+            VALUES (?, ?, ?, ?, ?, 'busy', ?, 0)
+            """, [(uuid.uuid4().hex, user_id, f"Meeting: {title}", start_time, end_time, block_priority)
+                  for user_id, _ in participants]),
+        ]
+        success = await self.db.execute_batch(statements)
+        return meeting_id if success else None
+
 # Global database manager instance
 db_manager = DatabaseManager()
 calendar_service = CalendarService(db_manager)
@@ -1,7 +1,9 @@
 """
 Decision engine for Alice's agent with real database integration
 """
-from typing import List, Dict, Any, Optional
+import time
+from bisect import bisect_left
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from models import (
     MeetingRequest, 
@@ -15,6 +17,9 @@ from models import (
 from database import calendar_service
 import random
 
+# How long (seconds) a loaded calendar is reused by later rounds of a negotiation
+CALENDAR_TTL = 60
+
 class AliceDecisionEngine:
     """Decision engine for Alice's agent with real schedule data"""
     
@@ -23,6 +28,25 @@ class AliceDecisionEngine:
         self.flexibility_score = 4  # Alice is focused, lower flexibility
         self.priority_threshold = 7  # High priority threshold for focus time
         self.user_id = "alice"  # Alice's user ID
+        # Alice's blocks sorted by start, as (loaded_at, blocks, starts, ends, longest block)
+        self._calendar: Optional[Tuple[float, List[Dict[str, Any]], List[datetime], List[datetime], timedelta]] = None
+        
+    async def _load_calendar(self, refresh: bool = False) -> Tuple:
+        """Fetch Alice's calendar once and keep it sorted by start for the rest of the negotiation"""
+        if not refresh and self._calendar is not None and time.monotonic() - self._calendar[0] < CALENDAR_TTL:
+            return self._calendar
+        
+        blocks = await calendar_service.get_user_calendar_blocks(self.user_id)
+        # Ties keep the query's order
+        parsed = sorted(
+            (datetime.fromisoformat(str(block['start_time'])), i, datetime.fromisoformat(str(block['end_time'])))
+            for i, block in enumerate(blocks)
+        )
+        starts = [start for start, _, _ in parsed]
+        ends = [end for _, _, end in parsed]
+        max_span = max((end - start for start, _, end in parsed), default=timedelta(0))
+        self._calendar = (time.monotonic(), [blocks[i] for _, i, _ in parsed], starts, ends, max_span)
+        return self._calendar
         
     async def analyze_meeting_request(self, ctx, request: MeetingRequest) -> ScheduleAnalysis:
         """
@@ -30,9 +54,9 @@ class AliceDecisionEngine:
         """
         ctx.logger.info(f"Analyzing meeting request: {request.title}")
         
-        # Get Alice's real calendar from database
-        calendar_blocks = await calendar_service.get_user_calendar_blocks(self.user_id)
-        ctx.logger.info(f"Retrieved {len(calendar_blocks)} calendar blocks for Alice")
+        # Get Alice's real calendar from database (a new request starts a new negotiation)
+        calendar = await self._load_calendar(refresh=True)
+        ctx.logger.info(f"Retrieved {len(calendar[1])} calendar blocks for Alice")
         
         # Check for conflicts with preferred time
         conflicts = []
@@ -43,7 +67,7 @@ class AliceDecisionEngine:
             conflicts = await self._check_time_conflicts(
                 request.preferred_start_time, 
                 end_time, 
-                calendar_blocks
+                calendar
             )
             
             if not conflicts:
@@ -57,7 +81,7 @@ class AliceDecisionEngine:
         # If preferred time has conflicts, find alternatives
         if conflicts:
             available_times = await self._find_alternative_times(
-                request, calendar_blocks
+                request, calendar
             )
         
         # Determine if Alice can attend based on her personality
@@ -111,14 +135,14 @@ class AliceDecisionEngine:
         ctx.logger.info(f"Evaluating time proposal: {proposal.proposed_time}")
         
         # Get Alice's real calendar
-        calendar_blocks = await calendar_service.get_user_calendar_blocks(self.user_id)
+        calendar = await self._load_calendar()
         
         # Check for conflicts
         end_time = proposal.proposed_time + timedelta(minutes=60)  # Default 1 hour
         conflicts = await self._check_time_conflicts(
             proposal.proposed_time, 
             end_time, 
-            calendar_blocks
+            calendar
         )
         
         # Determine acceptability based on Alice's focused personality
@@ -140,12 +164,12 @@ class AliceDecisionEngine:
         ctx.logger.info("Generating counter-proposal for Alice")
         
         # Get Alice's real calendar
-        calendar_blocks = await calendar_service.get_user_calendar_blocks(self.user_id)
+        calendar = await self._load_calendar()
         
         # Find alternative times near the original proposal
         alternatives = await self._find_alternative_times_near(
             original_proposal.proposed_time, 
-            calendar_blocks
+            calendar
         )
         
         if not alternatives:
@@ -162,17 +186,17 @@ class AliceDecisionEngine:
             confidence_score=best_alternative["confidence"]
         )
     
-    async def _check_time_conflicts(self, start_time: datetime, end_time: datetime, calendar_blocks: List[Dict[str, Any]]) -> List[str]:
+    async def _check_time_conflicts(self, start_time: datetime, end_time: datetime, calendar: Tuple) -> List[str]:
         """
-        Check for conflicts with calendar blocks
+        Check for conflicts with calendar blocks (as returned by _load_calendar)
         """
         conflicts = []
         
-        for block in calendar_blocks:
-            block_start = block['start_time']
-            block_end = block['end_time']
-            
-            if (start_time < block_end and end_time > block_start):
+        # Only blocks starting before end_time and at most one block length before start_time can overlap
+        _, blocks, starts, ends, max_span = calendar
+        for i in range(bisect_left(starts, start_time - max_span), bisect_left(starts, end_time)):
+            block = blocks[i]
+            if ends[i] > start_time:
                 if block['block_type'] == 'focus_time' and block['priority'] > self.priority_threshold:
                     conflicts.append(f"Conflicts with high-priority focus time: {block['title']}")
                 elif block['block_type'] == 'busy' and not block['is_moveable']:
@@ -182,11 +206,15 @@ class AliceDecisionEngine:
         
         return conflicts
     
-    async def _find_alternative_times(self, request: MeetingRequest, calendar_blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def _find_alternative_times(self, request: MeetingRequest, calendar: Tuple,
+                                      max_per_day: int = 4) -> List[Dict[str, Any]]:
         """
-        Find alternative times for a meeting
+        Find alternative times for a meeting, keeping each day's best max_per_day
         """
         alternatives = []
+        day_slots = []
+        duration = timedelta(minutes=request.duration_minutes)
+        one_hour = timedelta(hours=1)
         
         # Look for times in the next 7 days
         start_date = datetime.now()
@@ -195,6 +223,16 @@ class AliceDecisionEngine:
         current_time = start_date.replace(hour=9, minute=0, second=0, microsecond=0)  # Start at 9 AM
         
         while current_time < end_date:
+            if day_slots and current_time.date() != day_slots[0]["start"].date():
+                alternatives.extend(sorted(day_slots, key=lambda x: x["confidence"], reverse=True)[:max_per_day])
+                day_slots = []
+            
+            # Past the morning nothing rates higher than what the day already has,
+            # so once it is full the rest of the day can't make the cut
+            if current_time.hour >= 12 and len(day_slots) >= max_per_day:
+                current_time = datetime.combine(current_time.date() + timedelta(days=1), datetime.min.time())
+                continue
+            
             # Skip weekends for Alice (she prefers weekdays)
             if current_time.weekday() >= 5:  # Saturday = 5, Sunday = 6
                 current_time += timedelta(days=1)
@@ -203,11 +241,11 @@ class AliceDecisionEngine:
             
             # Skip lunch time (12-1 PM)
             if 12 <= current_time.hour < 13:
-                current_time += timedelta(hours=1)
+                current_time += one_hour
                 continue
             
-            end_time = current_time + timedelta(minutes=request.duration_minutes)
-            conflicts = await self._check_time_conflicts(current_time, end_time, calendar_blocks)
+            end_time = current_time + duration
+            conflicts = await self._check_time_conflicts(current_time, end_time, calendar)
             
             if not conflicts:
                 confidence = 0.8
@@ -218,7 +256,7 @@ class AliceDecisionEngine:
                     confidence = 0.9
                     reasoning += " (morning slot - preferred)"
                 
-                alternatives.append({
+                day_slots.append({
                     "start": current_time,
                     "end": end_time,
                     "confidence": confidence,
@@ -226,21 +264,23 @@ class AliceDecisionEngine:
                 })
             
             # Move to next hour
-            current_time += timedelta(hours=1)
+            current_time += one_hour
         
+        alternatives.extend(sorted(day_slots, key=lambda x: x["confidence"], reverse=True)[:max_per_day])
         return sorted(alternatives, key=lambda x: x["confidence"], reverse=True)
     
-    async def _find_alternative_times_near(self, original_time: datetime, calendar_blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def _find_alternative_times_near(self, original_time: datetime, calendar: Tuple) -> List[Dict[str, Any]]:
         """
         Find alternative times near the original proposed time
         """
         alternatives = []
+        one_hour = timedelta(minutes=60)
         
         # Try times 30 minutes before and after, then 1 hour before and after
         for offset in [-30, 30, -60, 60, -90, 90]:
             alt_time = original_time + timedelta(minutes=offset)
-            end_time = alt_time + timedelta(minutes=60)
-            conflicts = await self._check_time_conflicts(alt_time, end_time, calendar_blocks)
+            end_time = alt_time + one_hour
+            conflicts = await self._check_time_conflicts(alt_time, end_time, calendar)
             
             if not conflicts:
                 confidence = 0.8 - abs(offset) * 0.01
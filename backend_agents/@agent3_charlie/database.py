@@ -45,7 +45,7 @@ class CharlieCalendarService:
                                end_time: datetime, block_type: str = "busy", 
                                priority_level: int = 5, is_flexible: bool = False) -> str:
         """Add a calendar block for Charlie"""
-        block_id = str(uuid.uuid4())
+        block_id = uuid.uuid4().hex
         command = """
         INSERT INTO calendar_blocks (id, user_id, title, start_time, end_time, 
                                    block_type, priority_level, is_flexible)
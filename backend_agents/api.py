@@ -7,11 +7,16 @@ Returns meeting negotiation results in JSON format for frontend integration
 import asyncio
 import sys
 import os
-from datetime import datetime, timedelta
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
 from typing import Optional, List, Dict, Any, Tuple
 import uuid
 import re
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+import heapq
+import time
+from dataclasses import dataclass
+from operator import attrgetter, itemgetter
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
@@ -30,11 +35,155 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '@agent1_pappu'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '@agent2_alice'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '@agent3_charlie'))
 
+# Alice's database service, shared by all agents (found on the path above)
+try:
+    from database import calendar_service, db_manager, meeting_service
+except ImportError as e:
+    raise ImportError(f"Could not import the database service from @agent2_alice: {e}") from e
+
 # Agent addresses
 PAPPU_AGENT_ADDRESS = "agent1qfy2twzrw6ne43eufnzadxj0s3xpzlwd7vrgde5yrq46043kp8hpzpx6x75"  # Pappu's agent
 ALICE_AGENT_ADDRESS = "agent1qge95a5nqwjqgg0td05y9866jtjac7zf6g3908qjs330lm07kz8s799w9s8"  # Alice's agent
 CHARLIE_AGENT_ADDRESS = "agent1qge95a5nqwjqgg0td05y9866jtjac7zf6g3908qjs330lm07kz8s799w9s9"  # Charlie's agent
 
+# Accepted meeting lengths and the candidate slot grid
+_ALLOWED_DURATIONS: frozenset = frozenset({15, 30, 45, 60, 90, 120})
+_SLOT_HOURS = tuple(range(8, 17))            # 8 AM to 5 PM
+_SLOT_MINUTES = (0, 15, 30, 45)
+_SINGLE_AGENT_HOURS = tuple(range(8, 18))    # 8 AM to 6 PM
+_SINGLE_AGENT_MINUTES = (0, 30)
+
+# Lowest priority of a fixed block that rules a slot out for each agent:
+# Pappu is collaborative, Alice is stricter, Charlie is strategic
+_BLOCKING_PRIORITY = {"bob": 7, "alice": 8, "charlie": 6}
+
+# Quality score lookup tables. Distance from the preferred time: exact match (100),
+# within 1 hour (80), 2 hours (60), 4 hours (40), further away (20)
+_DISTANCE_BOUNDS = (0, 3600, 7200, 14400)
+_DISTANCE_SCORES = (100, 80, 60, 40, 20)
+# Time of day: morning 9-11 (10), afternoon 14-16 (8), early morning 8 (6), late afternoon 17 (4)
+_HOUR_SCORES = tuple(
+    10 if 9 <= hour <= 11 else 8 if 14 <= hour <= 16 else 6 if hour == 8 else 4 if hour == 17 else 0
+    for hour in range(24)
+)
+# Round times
+_MINUTE_SCORES = {0: 5, 30: 3}
+
+# Every slot on another day than the preferred one is at least this far from it (seconds)
+_OFF_DAY_MIN_DISTANCE = 4 * 3600 + 1
+
+# Per-day busy blocks are reused across requests for this long (seconds), up to this many (user, day) entries
+_BUSY_CACHE_TTL = 60
+_BUSY_CACHE_SIZE = 256
+# Days served from the cache after this long (seconds) are refetched in the background for the next search
+_BUSY_REFRESH_AFTER = _BUSY_CACHE_TTL // 2
+# Widest window_days any search passes to _search_window
+_MAX_SEARCH_WINDOW_DAYS = 5
+# Days of busy blocks loaded into the cache for every user right after connecting: enough for
+# any search preferring one of the next _MAX_SEARCH_WINDOW_DAYS days, well under _BUSY_CACHE_SIZE
+_PREFETCH_DAYS = 2 * _MAX_SEARCH_WINDOW_DAYS + 1
+_PREFETCH_USERS = ("bob", "alice", "charlie")
+
+# Users whose conflicts are described (anonymously) in the Gemini slot explanations
+_EXPLAINED_USERS = ("bob", "alice")
+
+_DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Strict input formats, matched before any integer parsing
+_DATE_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+_TIME_RE = re.compile(r'^(\d{2}):(\d{2})$')
+
+def _parse_date(s: str) -> datetime:
+    """Parse a YYYY-MM-DD string without going through strptime"""
+    m = _DATE_RE.match(s)
+    if not m:
+        raise ValueError(f"time data {s!r} does not match format '%Y-%m-%d'")
+    y, mo, d = map(int, m.groups())
+    return datetime(y, mo, d)
+
+def _parse_time(s: str) -> datetime:
+    """Parse an HH:MM string without going through strptime"""
+    m = _TIME_RE.match(s)
+    h, mi = map(int, m.groups()) if m else (-1, -1)
+    if not (0 <= h <= 23 and 0 <= mi <= 59):
+        raise ValueError(f"time data {s!r} does not match format '%H:%M'")
+    return datetime(1900, 1, 1, h, mi)
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_SECOND = timedelta(seconds=1)
+
+def _epoch_seconds(dt: datetime) -> int:
+    """Whole seconds since 1970-01-01 for a naive datetime (no timezone/DST adjustment)"""
+    return (dt - _EPOCH) // _ONE_SECOND
+
+def _slot_score(slot_epoch: int, preferred_epoch: int, time_score: int) -> int:
+    """Quality score of a slot from epoch seconds and its precomputed time-of-day score"""
+    return _DISTANCE_SCORES[bisect_left(_DISTANCE_BOUNDS, abs(slot_epoch - preferred_epoch))] + time_score
+
+def _conflicts_in(busy: Tuple, slot_start: int, slot_end: int) -> List[Dict[str, Any]]:
+    """Blocks from a busy index (see APINegotiation._load_busy) overlapping [slot_start, slot_end)"""
+    blocks, starts, ends, max_span = busy
+    lo = bisect_left(starts, slot_start - max_span)
+    hi = bisect_left(starts, slot_end)
+    return [blocks[i] for i in range(lo, hi) if ends[i] > slot_start]
+
+def _sweep_conflicts(busy: Tuple, windows: List[Tuple[int, int]]) -> List[List[Dict[str, Any]]]:
+    """_conflicts_in for each of a list of windows, in one forward pass over the busy index.
+    
+    Window starts and ends must both be non-decreasing (e.g. equal-length slots
+    in chronological order), so the two cursors never move back.
+    """
+    blocks, starts, ends, max_span = busy
+    count = len(starts)
+    lo = hi = 0
+    result = []
+    for slot_start, slot_end in windows:
+        while lo < count and starts[lo] < slot_start - max_span:
+            lo += 1
+        while hi < count and starts[hi] < slot_end:
+            hi += 1
+        result.append([blocks[i] for i in range(lo, hi) if ends[i] > slot_start])
+    return result
+
+_CELL_SECONDS = 15 * 60
+
+def _busy_mask(busy: Tuple, base_epoch: int, counts=None) -> int:
+    """Bitset of the 15-minute cells after base_epoch that a busy index's blocks overlap.
+    
+    Bit i covers [base_epoch + i*15min, base_epoch + (i+1)*15min); only blocks
+    for which counts(block) is true are marked. For slots made of whole cells,
+    a slot overlaps a marked block exactly when one of its cells is set.
+    """
+    blocks, starts, ends, _ = busy
+    mask = 0
+    run_first = run_last = 0
+    # Blocks come ordered by start, so overlapping and back-to-back blocks are
+    # merged into runs of cells and each run is set with a single shift
+    for block, start, end in zip(blocks, starts, ends):
+        if counts is not None and not counts(block):
+            continue
+        first = max(0, (start - base_epoch) // _CELL_SECONDS)
+        last = -((base_epoch - end) // _CELL_SECONDS)  # Round the end up to a cell boundary
+        if last <= first:
+            continue
+        if first <= run_last:
+            run_last = max(run_last, last)
+        else:
+            mask |= ((1 << (run_last - run_first)) - 1) << run_first
+            run_first, run_last = first, last
+    return mask | ((1 << (run_last - run_first)) - 1) << run_first
+
+def _slot_cells(duration: int) -> int:
+    """Bit pattern of the cells a slot of this many minutes covers, from its first cell"""
+    return (1 << -(-duration * 60 // _CELL_SECONDS)) - 1
+
+def _workdays(search_start: datetime, search_end: datetime) -> List:
+    """List the weekdays (Monday-Friday) between two datetimes, inclusive"""
+    # Ordinal 1 (0001-01-01) is a Monday, so (ordinal + 6) % 7 is the weekday
+    return [date.fromordinal(ordinal)
+            for ordinal in range(search_start.toordinal(), search_end.toordinal() + 1)
+            if (ordinal + 6) % 7 < 5]
+
 # Pydantic models for API
 class MeetingRequest(BaseModel):
     title: str
@@ -65,6 +214,21 @@ class NegotiationResult(BaseModel):
     message: str
     timestamp: str
 
+@dataclass(slots=True)
+class SlotCandidate:
+    """A free slot found by the search, plus the fields filled in for returned slots"""
+    start_time: datetime
+    end_time: datetime
+    quality_score: int
+    duration_minutes: int
+    conflicts: Tuple = ()
+    display: str = ""
+    end_hm: str = ""
+    day_of_week: str = ""
+    explanation: str = ""
+    agent_reasoning: Optional[Dict[str, str]] = None
+    specific_agent: Optional[str] = None
+
 class APINegotiation:
     """API version of the negotiation system"""
     
@@ -72,33 +236,170 @@ class APINegotiation:
         self.db_manager = None
         self.calendar_service = None
         self.meeting_service = None
+        self._setup_task: Optional[asyncio.Task] = None
+        self._prefetch_task: Optional[asyncio.Task] = None
+        # (user_id, date) -> (fetched_at, [(block, start_epoch, end_epoch), ...])
+        self._busy_cache: Dict[Tuple[str, Any], Tuple[float, List[tuple]]] = {}
+        # Bumped by every eviction, so a fetch that overlapped a write doesn't cache what it read
+        self._busy_generation = 0
+        # user_id -> background refetch of days a search found getting old
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        # user_id -> (fetched_at, whole calendar) for the calendar views
+        self._calendar_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        # Gemini client, configured on the first explanation and reused after that
+        self._gemini_model = None
     
     async def setup_database(self):
         """Setup database connection"""
         try:
-            # Import Alice's database service
-            # Use relative path from current script location
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            alice_agent_dir = os.path.join(script_dir, '@agent2_alice')
-            sys.path.append(alice_agent_dir)
-            from database import calendar_service, db_manager, meeting_service
-            
             self.db_manager = db_manager
             self.calendar_service = calendar_service
             self.meeting_service = meeting_service
             
             # Connect to database
             await self.db_manager.connect()
+            # Warm the busy cache for the coming weeks while no request is waiting on it
+            self._prefetch_task = asyncio.create_task(self._prefetch_busy(_PREFETCH_DAYS))
             return True
         except Exception as e:
             print(f"❌ Database setup failed: {e}")
             return False
     
+    def start_setup(self) -> None:
+        """Run setup_database in the background so startup doesn't wait on it"""
+        if self._setup_task is None:
+            self._setup_task = asyncio.create_task(self.setup_database())
+    
+    async def ready(self) -> bool:
+        """Wait for the background database setup (starting it if needed) and return its result"""
+        self.start_setup()
+        return await self._setup_task
+    
+    async def _fetch_busy(self, user_id: str, days: List) -> Dict[Any, List[tuple]]:
+        """Fetch a user's blocks for a run of consecutive days in one query and cache them per day
+        
+        A failed query raises before anything is cached, so an outage never looks like free days.
+        """
+        generation = self._busy_generation
+        window_start = datetime.combine(days[0], datetime.min.time())
+        per_day = {day: [] for day in days}
+        async for block in self.calendar_service.iter_blocks_in_range(user_id, window_start, window_start + timedelta(days=len(days))):
+            start_time = datetime.fromisoformat(str(block["start_time"]))
+            end_time = datetime.fromisoformat(str(block["end_time"]))
+            row = (block, _epoch_seconds(start_time), _epoch_seconds(end_time))
+            # File the block under every day of the run it overlaps
+            day = max(start_time.date(), days[0])
+            while day in per_day and datetime.combine(day, datetime.min.time()) < end_time:
+                per_day[day].append(row)
+                day += timedelta(days=1)
+        
+        if generation != self._busy_generation:
+            return per_day
+        now = time.monotonic()
+        for day, rows in per_day.items():
+            key = (user_id, day)
+            self._busy_cache.pop(key, None)
+            if len(self._busy_cache) >= _BUSY_CACHE_SIZE:
+                del self._busy_cache[next(iter(self._busy_cache))]  # Oldest entry first
+            self._busy_cache[key] = (now, rows)
+        return per_day
+    
+    async def _prefetch_busy(self, days: int) -> None:
+        """Load every user's blocks from today on into the busy cache"""
+        today = datetime.now().date()
+        window = [today + timedelta(days=offset) for offset in range(days)]
+        try:
+            await asyncio.gather(*(self._fetch_busy(user_id, window) for user_id in _PREFETCH_USERS))
+        except Exception as e:
+            print(f"❌ Busy block prefetch failed: {e}")
+    
+    async def _get_blocks(self, user_id: str) -> List[Dict[str, Any]]:
+        """A user's whole calendar, reused for _BUSY_CACHE_TTL seconds or until one of their blocks is written"""
+        cached = self._calendar_cache.get(user_id)
+        if cached is not None and time.monotonic() - cached[0] < _BUSY_CACHE_TTL:
+            return cached[1]
+        generation = self._busy_generation
+        fetched_at = time.monotonic()
+        try:
+            blocks = await self.calendar_service.get_user_calendar_blocks(user_id, raise_errors=True)
+        except Exception:
+            # Same empty calendar as before, but not cached, so the next view retries the query
+            return []
+        # Skip the cache if a write landed while the query ran
+        if generation == self._busy_generation:
+            self._calendar_cache[user_id] = (fetched_at, blocks)
+        return blocks
+    
+    async def _refresh_busy(self, user_id: str, days: List) -> None:
+        """Refetch a user's days into the busy cache ahead of the next search"""
+        try:
+            await self._fetch_busy(user_id, days)
+        except Exception as e:
+            print(f"❌ Busy block refresh failed: {e}")
+    
+    def _evict_busy(self, user_ids, start_time: datetime, end_time: datetime):
+        """Drop cached days a newly written block from start_time to end_time touches"""
+        self._busy_generation += 1
+        for user_id in user_ids:
+            self._calendar_cache.pop(user_id, None)
+        day = start_time.date()
+        while day <= end_time.date():
+            for user_id in user_ids:
+                self._busy_cache.pop((user_id, day), None)
+            day += timedelta(days=1)
+    
+    def _evict_all_busy(self):
+        """Drop every cached day and calendar, for writes whose user and day aren't known"""
+        self._busy_generation += 1
+        self._busy_cache.clear()
+        self._calendar_cache.clear()
+    
+    async def _load_busy(self, user_id: str, search_start: datetime, search_end: datetime) -> Tuple:
+        """Collect a user's blocks for the whole search window from the per-day cache, indexed by start epoch"""
+        days = [search_start.date() + timedelta(days=offset)
+                for offset in range((search_end.date() - search_start.date()).days + 1)]
+        # A search right after startup waits for the prefetch rather than repeating its queries
+        if self._prefetch_task is not None and not self._prefetch_task.done():
+            await self._prefetch_task
+        
+        now = time.monotonic()
+        per_day = {}
+        oldest = now
+        for day in days:
+            cached = self._busy_cache.get((user_id, day))
+            if cached is not None and now - cached[0] < _BUSY_CACHE_TTL:
+                per_day[day] = cached[1]
+                oldest = min(oldest, cached[0])
+        missing = [day for day in days if day not in per_day]
+        if missing:
+            # Refetch from the first to the last stale day in one query
+            per_day.update(await self._fetch_busy(user_id, days[days.index(missing[0]):days.index(missing[-1]) + 1]))
+        elif now - oldest >= _BUSY_REFRESH_AFTER:
+            # Serve this search from the cache, but refetch the window in the background
+            # so the follow-up search (e.g. /schedule after /negotiate) doesn't wait on it
+            refresh = self._refresh_tasks.get(user_id)
+            if refresh is None or refresh.done():
+                self._refresh_tasks[user_id] = asyncio.create_task(self._refresh_busy(user_id, days))
+        
+        blocks, starts, ends = [], [], []
+        max_span = 0
+        for day in days:
+            day_epoch = _epoch_seconds(datetime.combine(day, datetime.min.time()))
+            for block, start, end in per_day[day]:
+                # A block spilling over from an earlier day of the window is already listed
+                if start < day_epoch and day != days[0]:
+                    continue
+                blocks.append(block)
+                starts.append(start)
+                ends.append(end)
+                max_span = max(max_span, end - start)
+        return blocks, starts, ends, max_span
+    
     def validate_input(self, request: MeetingRequest) -> Tuple[bool, str]:
         """Validate the meeting request input"""
         try:
             # Validate date
-            preferred_date = datetime.strptime(request.preferred_date, "%Y-%m-%d")
+            preferred_date = _parse_date(request.preferred_date)
             if preferred_date.weekday() >= 5:  # Weekend
                 day_name = preferred_date.strftime("%A")
                 return False, f"{day_name} is a weekend. Date must be a weekday (Monday-Friday)"
@@ -110,12 +411,12 @@ class APINegotiation:
                 return False, "Date must be before 2025-10-27"
             
             # Validate time
-            preferred_time = datetime.strptime(request.preferred_time, "%H:%M")
+            preferred_time = _parse_time(request.preferred_time)
             if preferred_time.hour < 8 or preferred_time.hour >= 17:
                 return False, "Time must be between 08:00 and 17:00"
             
             # Validate duration
-            if request.duration_minutes not in [15, 30, 45, 60, 90, 120]:
+            if request.duration_minutes not in _ALLOWED_DURATIONS:
                 return False, "Duration must be 15, 30, 45, 60, 90, or 120 minutes"
             
             return True, "Valid input"
@@ -123,10 +424,10 @@ class APINegotiation:
         except ValueError as e:
             return False, f"Invalid format: {str(e)}"
     
-    async def find_available_slots(self, request: MeetingRequest) -> List[Dict[str, Any]]:
+    async def find_available_slots(self, request: MeetingRequest) -> List[SlotCandidate]:
         """Find available time slots with proper AI agent negotiation"""
-        preferred_date = datetime.strptime(request.preferred_date, "%Y-%m-%d")
-        preferred_time = datetime.strptime(request.preferred_time, "%H:%M")
+        preferred_date = _parse_date(request.preferred_date)
+        preferred_time = _parse_time(request.preferred_time)
         preferred_datetime = preferred_date.replace(
             hour=preferred_time.hour, 
             minute=preferred_time.minute, 
@@ -141,78 +442,15 @@ class APINegotiation:
         else:
             return await self.find_external_meeting_slots_api(preferred_datetime, duration)
     
-    async def negotiate_with_ai_agent_api(self, preferred_datetime: datetime, duration: int) -> List[Dict[str, Any]]:
+    async def negotiate_with_ai_agent_api(self, preferred_datetime: datetime, duration: int) -> List[SlotCandidate]:
         """3-Agent AI negotiation between Pappu, Alice, and Charlie (API version)"""
         # Search window: 5 days before and after preferred date for better negotiation
-        # But ensure we don't search before today or beyond database range
-        today = datetime.now().date()
-        db_end_date = datetime(2025, 10, 27).date()
-        search_start = max(preferred_datetime - timedelta(days=5), datetime.combine(today, datetime.min.time()))
-        search_end = min(preferred_datetime + timedelta(days=5), datetime.combine(db_end_date, datetime.max.time()))
-        
-        available_slots = []
-        
-        # Check each day in the search window
-        current_date = search_start.date()
-        end_date = search_end.date()
-        
-        while current_date <= end_date:
-            # Skip weekends
-            if current_date.weekday() >= 5:
-                current_date += timedelta(days=1)
-                continue
-            
-            # Check each hour from 8 AM to 5 PM
-            for hour in range(8, 17):
-                for minute in [0, 15, 30, 45]:
-                    test_start = datetime.combine(current_date, datetime.min.time().replace(hour=hour, minute=minute))
-                    test_end = test_start + timedelta(minutes=duration)
-                    
-                    # Skip if it goes past 5 PM
-                    if test_end.hour >= 17:
-                        continue
-                    
-                    # Check availability for all three users
-                    pappu_conflicts = await self.calendar_service.check_time_conflict("bob", test_start, test_end)
-                    alice_conflicts = await self.calendar_service.check_time_conflict("alice", test_start, test_end)
-                    charlie_conflicts = await self.calendar_service.check_time_conflict("charlie", test_start, test_end)
-                    
-                    # Analyze conflicts for each agent with their personality
-                    pappu_has_conflict = any(not conflict.get('is_moveable', False) and conflict.get('priority', 5) >= 7 for conflict in pappu_conflicts)
-                    alice_has_conflict = any(not conflict.get('is_moveable', False) and conflict.get('priority', 5) >= 8 for conflict in alice_conflicts)  # Alice is stricter
-                    charlie_has_conflict = any(not conflict.get('is_moveable', False) and conflict.get('priority', 5) >= 6 for conflict in charlie_conflicts)  # Charlie is strategic
-                    
-                    if not pappu_has_conflict and not alice_has_conflict and not charlie_has_conflict:
-                        # Calculate quality score with 3-agent considerations
-                        quality_score = self.calculate_3agent_slot_quality(test_start, preferred_datetime, pappu_conflicts, alice_conflicts, charlie_conflicts)
-                        
-                        available_slots.append({
-                            "start_time": test_start,
-                            "end_time": test_end,
-                            "quality_score": quality_score,
-                            "duration_minutes": duration,
-                            "agent_reasoning": {
-                                "pappu": self.generate_pappu_reasoning(test_start, pappu_conflicts),
-                                "alice": self.generate_alice_reasoning(test_start, alice_conflicts),
-                                "charlie": self.generate_charlie_reasoning(test_start, charlie_conflicts)
-                            }
-                        })
-            
-            current_date += timedelta(days=1)
-        
-        # Sort by quality score (higher is better)
-        available_slots.sort(key=lambda x: x["quality_score"], reverse=True)
-        
-        # Generate dynamic explanations using Gemini
-        for i, slot in enumerate(available_slots[:3]):
-            slot["explanation"] = await self.generate_slot_explanation(slot, preferred_datetime, i)
-        
-        return available_slots[:3]  # Return top 3 options for 3-agent negotiation
+        return await self._find_slots(preferred_datetime, duration, ("bob", "alice", "charlie"), window_days=5)
     
-    async def find_single_agent_slots(self, request: MeetingRequest) -> List[Dict[str, Any]]:
+    async def find_single_agent_slots(self, request: MeetingRequest) -> List[SlotCandidate]:
         """Find available time slots for a specific agent only"""
-        preferred_date = datetime.strptime(request.preferred_date, "%Y-%m-%d")
-        preferred_time = datetime.strptime(request.preferred_time, "%H:%M")
+        preferred_date = _parse_date(request.preferred_date)
+        preferred_time = _parse_time(request.preferred_time)
         preferred_datetime = preferred_date.replace(
             hour=preferred_time.hour, 
             minute=preferred_time.minute, 
@@ -234,182 +472,292 @@ class APINegotiation:
             raise HTTPException(status_code=400, detail=f"Unknown agent: {request.specific_agent}")
         
         # Search window: 5 days before and after preferred date
-        today = datetime.now().date()
-        db_end_date = datetime(2025, 10, 27).date()
-        search_start = max(preferred_datetime - timedelta(days=5), datetime.combine(today, datetime.min.time()))
-        search_end = min(preferred_datetime + timedelta(days=5), datetime.combine(db_end_date, datetime.max.time()))
+        now = datetime.now()
+        search_start, search_end = self._search_window(preferred_datetime, 5)
         
         available_slots = []
+        preferred_epoch = _epoch_seconds(preferred_datetime)
+        busy = await self._load_busy(user_id, search_start, search_end)
+        base_epoch = _epoch_seconds(datetime.combine(search_start.date(), datetime.min.time()))
+        busy_cells = _busy_mask(busy, base_epoch)
+        slot_cells = _slot_cells(duration)
+        
+        now_epoch = _epoch_seconds(now)
+        duration_delta = timedelta(minutes=duration)
+        # Check time slots from 8 AM to 6 PM, every 30 minutes, as offsets from midnight
+        slot_offsets = [(hour, minute, hour * 3600 + minute * 60)
+                        for hour in _SINGLE_AGENT_HOURS for minute in _SINGLE_AGENT_MINUTES]
+        
+        # Check each weekday in the search window (business meetings only)
+        for current_date in _workdays(search_start, search_end):
+            year, month, day = current_date.year, current_date.month, current_date.day
+            day_epoch = _epoch_seconds(datetime(year, month, day))
+            for hour, minute, offset in slot_offsets:
+                test_epoch = day_epoch + offset
+                
+                # Don't suggest times in the past
+                if test_epoch <= now_epoch:
+                    continue
+                
+                # Check for conflicts with the specific agent only
+                if not busy_cells >> ((test_epoch - base_epoch) // _CELL_SECONDS) & slot_cells:
+                    # Calculate quality score
+                    quality_score = self.calculate_slot_quality(test_epoch, hour, minute, preferred_epoch)
+                    
+                    # Only free slots get datetimes
+                    test_start = datetime(year, month, day, hour, minute)
+                    available_slots.append(SlotCandidate(
+                        test_start, test_start + duration_delta, quality_score, duration,
+                        specific_agent=request.specific_agent
+                    ))
         
-        # Check each day in the search window
-        current_date = search_start.date()
-        end_date = search_end.date()
-        
-        while current_date <= end_date:
-            # Skip weekends for business meetings
-            if current_date.weekday() < 5:  # Monday=0, Friday=4
-                # Check time slots from 8 AM to 6 PM
-                for hour in range(8, 18):
-                    for minute in [0, 30]:  # Check every 30 minutes
-                        test_start = datetime.combine(current_date, datetime.min.time()).replace(hour=hour, minute=minute)
-                        test_end = test_start + timedelta(minutes=duration)
-                        
-                        # Don't suggest times in the past
-                        if test_start <= datetime.now():
-                            continue
-                        
-                        # Check for conflicts with the specific agent only
-                        conflicts = await self.calendar_service.check_time_conflict(user_id, test_start, test_end)
-                        
-                        if not conflicts:
-                            # Calculate quality score
-                            quality_score = self.calculate_slot_quality(test_start, preferred_datetime)
-                            
-                            available_slots.append({
-                                "start_time": test_start,
-                                "end_time": test_end,
-                                "quality_score": quality_score,
-                                "duration_minutes": duration,
-                                "specific_agent": request.specific_agent
-                            })
-            
-            current_date += timedelta(days=1)
-        
-        # Sort by quality score (higher is better)
-        available_slots.sort(key=lambda x: x["quality_score"], reverse=True)
+        # Keep the three best by quality score (higher is better)
+        available_slots = heapq.nlargest(3, available_slots, key=attrgetter("quality_score"))
         
         # Generate dynamic explanations
-        for i, slot in enumerate(available_slots[:3]):
-            if i == 0 and slot["start_time"] == preferred_datetime:
-                slot["explanation"] = f"Perfect! {request.specific_agent.title()} is available at your requested time."
+        for i, slot in enumerate(available_slots):
+            self._add_display_fields(slot)
+            if i == 0 and slot.start_time == preferred_datetime:
+                slot.explanation = f"Perfect! {request.specific_agent.title()} is available at your requested time."
             else:
-                slot["explanation"] = f"Great alternative time that works well with {request.specific_agent.title()}'s schedule."
+                slot.explanation = f"Great alternative time that works well with {request.specific_agent.title()}'s schedule."
         
-        return available_slots[:3]  # Return top 3 options
+        return available_slots  # Top 3 options
     
-    async def find_external_meeting_slots_api(self, preferred_datetime: datetime, duration: int) -> List[Dict[str, Any]]:
+    async def find_external_meeting_slots_api(self, preferred_datetime: datetime, duration: int) -> List[SlotCandidate]:
         """Find slots for external meetings (only Pappu's schedule) - API version"""
         # Search window: 3 days before and after preferred date
-        # But ensure we don't search before today or beyond database range
+        return await self._find_slots(preferred_datetime, duration, ("bob",), window_days=3)
+    
+    def _search_window(self, preferred_datetime: datetime, window_days: int) -> Tuple[datetime, datetime]:
+        """Search window around the preferred time, clamped to today and the database range"""
         today = datetime.now().date()
         db_end_date = datetime(2025, 10, 27).date()
-        search_start = max(preferred_datetime - timedelta(days=3), datetime.combine(today, datetime.min.time()))
-        search_end = min(preferred_datetime + timedelta(days=3), datetime.combine(db_end_date, datetime.max.time()))
-        
+        search_start = max(preferred_datetime - timedelta(days=window_days), datetime.combine(today, datetime.min.time()))
+        search_end = min(preferred_datetime + timedelta(days=window_days), datetime.combine(db_end_date, datetime.max.time()))
+        return search_start, search_end
+    
+    async def _find_slots(self, preferred_datetime: datetime, duration: int,
+                          users: Tuple[str, ...], window_days: int) -> List[SlotCandidate]:
+        """Shared slot search for the 3-agent and external meeting flows.
+        
+        With a single user any conflict rules a slot out; with the three agents
+        only fixed blocks at or above each agent's priority threshold do, and the
+        slot is scored with the 3-agent preferences.
+        """
+        search_start, search_end = self._search_window(preferred_datetime, window_days)
+        agent_meeting = len(users) > 1
+        
+        preferred_epoch = _epoch_seconds(preferred_datetime)
+        
+        # Load each user's calendar for the window once instead of querying per slot;
+        # Pappu's and Alice's are also needed for the slot explanations
+        load_users = tuple(dict.fromkeys(users + _EXPLAINED_USERS))
+        loaded = dict(zip(load_users, await asyncio.gather(
+            *(self._load_busy(user_id, search_start, search_end) for user_id in load_users)
+        )))
+        busy = [loaded[user_id] for user_id in users]
+        # Cells taken by blocks that rule a slot out: with the three agents only fixed
+        # blocks at or above each agent's priority threshold, otherwise any block.
+        # The users' cells are unioned so each slot needs one availability test
+        base_epoch = _epoch_seconds(datetime.combine(search_start.date(), datetime.min.time()))
+        blocked = 0
+        for user_id, user_busy in zip(users, busy):
+            if agent_meeting:
+                blocked |= _busy_mask(user_busy, base_epoch, lambda conflict, threshold=_BLOCKING_PRIORITY[user_id]:
+                                      not conflict.get('is_moveable', False) and conflict.get('priority', 5) >= threshold)
+            else:
+                blocked |= _busy_mask(user_busy, base_epoch)
+        
+        # Score the preferred day first, then the other days highest ceiling first. A
+        # slot on another day is always more than 4 hours away, so it can score at most
+        # that distance score plus the best time-of-day score on the grid (plus the day
+        # bonus for agent meetings). A day whose ceiling is below the third best score
+        # found so far can't change the result and is skipped
+        workdays = _workdays(search_start, search_end)
+        preferred_date = preferred_datetime.date()
+        grid = self._slot_grid(agent_meeting, duration)
+        off_day_max = self._distance_score(_OFF_DAY_MIN_DISTANCE) + max((cell[3] for cell in grid), default=0)
+        ceilings = {
+            current_date: off_day_max + (self._3agent_day_bonus(current_date.weekday()) if agent_meeting else 0)
+            for current_date in workdays if current_date != preferred_date
+        }
+        scan_order = sorted(ceilings, key=ceilings.get, reverse=True)
+        if preferred_date in workdays:
+            scan_order.insert(0, preferred_date)
+        
+        day_slots = {}
+        top_scores = []  # Min-heap of the three best scores so far
+        for current_date in scan_order:
+            if len(top_scores) == 3 and ceilings[current_date] < top_scores[0]:
+                continue
+            day_slots[current_date] = self._scan_day(current_date, duration, busy, blocked, base_epoch, preferred_epoch, grid)
+            for quality_score in day_slots[current_date][0]:
+                if len(top_scores) < 3:
+                    heapq.heappush(top_scores, quality_score)
+                elif quality_score > top_scores[0]:
+                    heapq.heapreplace(top_scores, quality_score)
+        
+        # Rebuild chronological order so ties resolve to the earliest slot, as score,
+        # start and conflict columns
+        scores, starts, conflicts = [], [], []
+        for current_date in workdays:
+            if current_date in day_slots:
+                day_scores, day_starts, day_conflicts = day_slots[current_date]
+                scores += day_scores
+                starts += [(current_date, hour, minute) for hour, minute in day_starts]
+                conflicts += day_conflicts
+        
+        # Keep the three best by quality score (higher is better) and only build those
         available_slots = []
+        for i in heapq.nlargest(3, range(len(scores)), key=scores.__getitem__):
+            current_date, hour, minute = starts[i]
+            test_start = datetime(current_date.year, current_date.month, current_date.day, hour, minute)
+            available_slots.append(SlotCandidate(
+                test_start, test_start + timedelta(minutes=duration), scores[i], duration, conflicts[i]
+            ))
         
-        # Check each day in the search window
-        current_date = search_start.date()
-        end_date = search_end.date()
+        # Format and reason about the returned slots only
+        for slot in available_slots:
+            conflicts, slot.conflicts = slot.conflicts, ()
+            if agent_meeting:
+                pappu_conflicts, alice_conflicts, charlie_conflicts = conflicts
+                slot.agent_reasoning = {
+                    "pappu": self.generate_pappu_reasoning(slot.start_time, pappu_conflicts),
+                    "alice": self.generate_alice_reasoning(slot.start_time, alice_conflicts),
+                    "charlie": self.generate_charlie_reasoning(slot.start_time, charlie_conflicts)
+                }
+            self._add_display_fields(slot)
+        
+        # Generate dynamic explanations using Gemini, all slots at once
+        explanations = await asyncio.gather(*(
+            self.generate_slot_explanation(
+                slot, preferred_datetime, i,
+                *(self._slot_conflicts(loaded[user_id], slot) for user_id in _EXPLAINED_USERS)
+            )
+            for i, slot in enumerate(available_slots)
+        ))
+        for slot, explanation in zip(available_slots, explanations):
+            slot.explanation = explanation
         
-        while current_date <= end_date:
-            # Skip weekends
-            if current_date.weekday() >= 5:
-                current_date += timedelta(days=1)
+        return available_slots  # Top 3 options
+    
+    def _slot_grid(self, agent_meeting: bool, duration: int) -> List[Tuple[int, int, int, int]]:
+        """Candidate starts within a day as (hour, minute, seconds after midnight, time-of-day score).
+        
+        Only starts whose meeting ends before 5 PM are listed (a meeting may not
+        end in the 17:00 hour), and the time-of-day part of the quality score is
+        the same on every day, so both are worked out once per search.
+        """
+        return [
+            (hour, minute, hour * 3600 + minute * 60,
+             self._time_of_day_score(hour, minute) + (self._3agent_time_bonus(hour, minute) if agent_meeting else 0))
+            for hour in _SLOT_HOURS      # Each hour from 8 AM to 5 PM
+            for minute in _SLOT_MINUTES
+            if hour * 60 + minute + duration < 17 * 60
+        ]
+    
+    def _scan_day(self, current_date, duration: int, busy: List[tuple], blocked: int, base_epoch: int,
+                  preferred_epoch: int, grid: List[Tuple[int, int, int, int]]) -> Tuple[List[int], List[tuple], List[tuple]]:
+        """Score every open slot on one weekday against the preloaded busy indexes and blocked cells.
+        
+        Returns parallel lists in chronological order: quality scores, (hour, minute)
+        starts and per-user conflicts, so only the winning slots become SlotCandidates.
+        """
+        agent_meeting = len(busy) > 1
+        day_epoch = _epoch_seconds(datetime(current_date.year, current_date.month, current_date.day))
+        slot_cells = _slot_cells(duration)
+        scores, starts, epochs = [], [], []
+        for hour, minute, offset, time_score in grid:
+            # Check availability for every participant
+            test_epoch = day_epoch + offset
+            if blocked >> (test_epoch - base_epoch) // _CELL_SECONDS & slot_cells:
                 continue
-            
-            # Check each hour from 8 AM to 5 PM
-            for hour in range(8, 17):
-                for minute in [0, 15, 30, 45]:
-                    test_start = datetime.combine(current_date, datetime.min.time().replace(hour=hour, minute=minute))
-                    test_end = test_start + timedelta(minutes=duration)
-                    
-                    # Skip if it goes past 5 PM
-                    if test_end.hour >= 17:
-                        continue
-                    
-                    # Check availability for Pappu only
-                    pappu_conflicts = await self.calendar_service.check_time_conflict("bob", test_start, test_end)
-                    
-                    if not pappu_conflicts:
-                        # Calculate quality score
-                        quality_score = self.calculate_slot_quality(test_start, preferred_datetime)
-                        available_slots.append({
-                            "start_time": test_start,
-                            "end_time": test_end,
-                            "quality_score": quality_score,
-                            "duration_minutes": duration
-                        })
-            
-            current_date += timedelta(days=1)
-        
-        # Sort by quality score (higher is better)
-        available_slots.sort(key=lambda x: x["quality_score"], reverse=True)
-        
-        # Generate dynamic explanations using Gemini
-        for i, slot in enumerate(available_slots[:3]):
-            slot["explanation"] = await self.generate_slot_explanation(slot, preferred_datetime, i)
-        
-        return available_slots[:3]  # Return top 3 options
+            scores.append(_slot_score(test_epoch, preferred_epoch, time_score))
+            starts.append((hour, minute))
+            epochs.append(test_epoch)
+        
+        if not agent_meeting:
+            return scores, starts, [()] * len(scores)
+        
+        # Analyze the remaining (moveable or lower-priority) conflicts for each agent,
+        # sweeping each calendar once across the day's open slots
+        windows = [(test_epoch, test_epoch + duration * 60) for test_epoch in epochs]
+        conflicts = list(zip(*(_sweep_conflicts(user_busy, windows) for user_busy in busy)))
+        day_bonus = self._3agent_day_bonus(current_date.weekday())
+        # Add the agents' day preferences and conflict penalties (their time-of-day bonus is in the grid score)
+        scores = [max(0, quality_score + day_bonus + self._3agent_conflict_adjustment(*slot_conflicts))
+                  for quality_score, slot_conflicts in zip(scores, conflicts)]
+        return scores, starts, conflicts
     
-    def calculate_slot_quality(self, slot_time: datetime, preferred_time: datetime) -> int:
-        """Calculate quality score for a time slot"""
-        score = 0
-        
-        # Prefer slots closer to preferred time
-        time_diff = abs((slot_time - preferred_time).total_seconds() / 3600)  # hours
-        if time_diff == 0:
-            score += 100  # Exact match
-        elif time_diff <= 1:
-            score += 80   # Within 1 hour
-        elif time_diff <= 2:
-            score += 60   # Within 2 hours
-        elif time_diff <= 4:
-            score += 40   # Within 4 hours
-        else:
-            score += 20   # Further away
-        
-        # Prefer certain times of day
-        if 9 <= slot_time.hour <= 11:  # Morning
-            score += 10
-        elif 14 <= slot_time.hour <= 16:  # Afternoon
-            score += 8
-        elif 8 <= slot_time.hour <= 9:  # Early morning
-            score += 6
-        elif 16 <= slot_time.hour <= 17:  # Late afternoon
-            score += 4
-        
-        # Prefer round times
-        if slot_time.minute == 0:
-            score += 5
-        elif slot_time.minute == 30:
-            score += 3
-        
-        return score
+    async def _check_conflicts(self, user_id: str, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
+        """check_time_conflict answered from the busy cache (only stale days go to the database)"""
+        busy = await self._load_busy(user_id, start_time, end_time)
+        conflicts = _conflicts_in(busy, _epoch_seconds(start_time), _epoch_seconds(end_time))
+        return sorted(conflicts, key=itemgetter("priority"), reverse=True)
     
-    def calculate_3agent_slot_quality(self, slot_time: datetime, preferred_time: datetime, 
-                                    pappu_conflicts: List, alice_conflicts: List, charlie_conflicts: List) -> int:
-        """Calculate quality score considering all three agents' preferences"""
-        base_score = self.calculate_slot_quality(slot_time, preferred_time)
-        
-        # Agent-specific bonuses/penalties
-        agent_adjustments = 0
-        
+    def _slot_conflicts(self, busy: Tuple, slot: SlotCandidate) -> List[Dict[str, Any]]:
+        """A slot's conflicts from a preloaded busy index, highest priority first"""
+        slot_epoch = _epoch_seconds(slot.start_time)
+        conflicts = _conflicts_in(busy, slot_epoch, slot_epoch + slot.duration_minutes * 60)
+        return sorted(conflicts, key=itemgetter("priority"), reverse=True)
+    
+    def _add_display_fields(self, slot: SlotCandidate) -> None:
+        """Format a returned slot's display strings once so consumers don't re-run strftime"""
+        start_time = slot.start_time
+        slot.display = start_time.strftime('%A, %B %d at %I:%M %p')
+        slot.end_hm = slot.end_time.strftime('%I:%M %p')
+        slot.day_of_week = _DAY_NAMES[start_time.weekday()]
+    
+    def calculate_slot_quality(self, slot_epoch: int, slot_hour: int, slot_minute: int, preferred_epoch: int) -> int:
+        """Calculate quality score for a time slot (times given as epoch seconds)"""
+        return _slot_score(slot_epoch, preferred_epoch, self._time_of_day_score(slot_hour, slot_minute))
+    
+    def _distance_score(self, time_diff: int) -> int:
+        """Prefer slots closer to preferred time (difference in seconds)"""
+        return _DISTANCE_SCORES[bisect_left(_DISTANCE_BOUNDS, time_diff)]
+    
+    def _time_of_day_score(self, slot_hour: int, slot_minute: int) -> int:
+        """Part of the quality score that only depends on the time of day"""
+        return _HOUR_SCORES[slot_hour] + _MINUTE_SCORES.get(slot_minute, 0)
+    
+    def _3agent_time_bonus(self, hour: int, minute: int) -> int:
+        """Agent preferences that only depend on the time of day"""
+        bonus = 0
+        # Pappu (Bob) - Likes standard meeting times
+        if 9 <= hour <= 11 or 14 <= hour <= 16:
+            bonus += 3
+        # Alice - Prefers specific hours
+        if hour in [10, 11, 14, 15]:
+            bonus += 5
+        # Charlie - Loves round hours and strategic time blocks
+        if minute == 0:
+            bonus += 8
+        if 9 <= hour <= 11 or 14 <= hour <= 16:
+            bonus += 6
+        return bonus
+    
+    def _3agent_day_bonus(self, weekday: int) -> int:
+        """Agent preferences that only depend on the day"""
+        if weekday in [1, 2, 3]:  # Tuesday-Thursday (Charlie's peak)
+            return 4
+        return 0
+    
+    def _3agent_conflict_adjustment(self, pappu_conflicts: List, alice_conflicts: List, charlie_conflicts: List) -> int:
+        """Agent penalties for the conflicts a slot would override"""
+        adjustment = 0
         # Pappu (Bob) - Collaborative, flexible
         if pappu_conflicts:
-            agent_adjustments -= 5  # Small penalty for conflicts
-        if 9 <= slot_time.hour <= 11 or 14 <= slot_time.hour <= 16:
-            agent_adjustments += 3  # Likes standard meeting times
-        
+            adjustment -= 5  # Small penalty for conflicts
         # Alice - Focused, protective of deep work
         if alice_conflicts:
-            agent_adjustments -= 15  # Heavy penalty for conflicts
-        if slot_time.hour in [10, 11, 14, 15]:  # Prefers specific hours
-            agent_adjustments += 5
+            adjustment -= 15  # Heavy penalty for conflicts
         if any('focus' in str(conflict.get('block_type', '')).lower() for conflict in alice_conflicts):
-            agent_adjustments -= 25  # Severe penalty for focus time conflicts
-        
+            adjustment -= 25  # Severe penalty for focus time conflicts
         # Charlie - Strategic, efficiency-focused
         if charlie_conflicts:
-            agent_adjustments -= 8  # Moderate penalty
-        if slot_time.minute == 0:  # Charlie loves round hours
-            agent_adjustments += 8
-        if 9 <= slot_time.hour <= 11 or 14 <= slot_time.hour <= 16:  # Strategic time blocks
-            agent_adjustments += 6
-        if slot_time.weekday() in [1, 2, 3]:  # Tuesday-Thursday (Charlie's peak)
-            agent_adjustments += 4
-        
-        return max(0, base_score + agent_adjustments)
+            adjustment -= 8  # Moderate penalty
+        return adjustment
     
     def generate_pappu_reasoning(self, slot_time: datetime, conflicts: List) -> str:
         """Generate Pappu's (Bob's) collaborative reasoning"""
@@ -454,26 +802,25 @@ class APINegotiation:
         
         return f"Acceptable compromise at {slot_time.strftime('%I:%M %p')}. Minor scheduling adjustments needed, but overall efficiency maintained."
     
-    async def generate_slot_explanation(self, slot: Dict[str, Any], preferred_datetime: datetime, slot_index: int) -> str:
-        """Generate dynamic explanation using Gemini AI while maintaining privacy"""
-        try:
+    def _explanation_model(self):
+        """Gemini model shared by every explanation, configured on first use"""
+        if self._gemini_model is None:
             # Configure Gemini with environment variable and latest model
             api_key = os.getenv('GEMINI_API_KEY')
             if not api_key:
                 raise Exception("GEMINI_API_KEY not found in environment variables")
             
             genai.configure(api_key=api_key)
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            
-            # Get conflicts for this time slot to understand why it's available/not available
-            start_time = slot["start_time"]
-            end_time = slot["end_time"]
-            
-            # Check conflicts for both users
-            pappu_conflicts = await self.calendar_service.check_time_conflict("bob", start_time, end_time)
-            alice_conflicts = await self.calendar_service.check_time_conflict("alice", start_time, end_time)
+            self._gemini_model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        return self._gemini_model
+    
+    async def generate_slot_explanation(self, slot: SlotCandidate, preferred_datetime: datetime, slot_index: int,
+                                        pappu_conflicts: List, alice_conflicts: List) -> str:
+        """Generate dynamic explanation using Gemini AI while maintaining privacy"""
+        try:
+            model = self._explanation_model()
             
-            # Prepare context for Gemini (without revealing specific names)
+            # Prepare context for Gemini from both users' conflicts (without revealing specific names)
             conflicts_info = []
             if pappu_conflicts:
                 for conflict in pappu_conflicts:
@@ -484,15 +831,15 @@ class APINegotiation:
             
             # Create prompt for Gemini
             preferred_start = datetime.combine(preferred_datetime.date(), preferred_datetime.time())
-            is_exact_match = slot["start_time"] == preferred_start
+            is_exact_match = slot.start_time == preferred_start
             
             prompt = f"""
             You are a scheduling assistant. Generate a brief, helpful explanation for a meeting time slot.
             
             Context:
             - Requested time: {preferred_datetime.strftime('%A, %B %d at %I:%M %p')}
-            - Available slot: {start_time.strftime('%A, %B %d at %I:%M %p')} - {end_time.strftime('%I:%M %p')}
-            - Slot quality score: {slot['quality_score']}
+            - Available slot: {slot.display} - {slot.end_hm}
+            - Slot quality score: {slot.quality_score}
             - Slot position: {slot_index + 1} (1st, 2nd, or 3rd best option)
             - Exact time match: {is_exact_match}
             
@@ -515,7 +862,7 @@ class APINegotiation:
             Generate explanation:
             """
             
-            response = model.generate_content(prompt)
+            response = await model.generate_content_async(prompt)
             explanation = response.text.strip()
             
             # Fallback to simple explanation if Gemini fails
@@ -533,7 +880,7 @@ class APINegotiation:
             print(f"Error generating explanation with Gemini: {e}")
             # Fallback to simple explanations
             preferred_start = datetime.combine(preferred_datetime.date(), preferred_datetime.time())
-            is_exact_match = slot["start_time"] == preferred_start
+            is_exact_match = slot.start_time == preferred_start
             
             if is_exact_match:
                 return "This is your preferred time and it's available!"
@@ -542,69 +889,44 @@ class APINegotiation:
             else:
                 return "This alternative time slot works well around existing commitments."
     
-    def format_slots_for_api(self, slots: List[Dict[str, Any]]) -> List[TimeSlot]:
+    def format_slots_for_api(self, slots: List[SlotCandidate]) -> List[TimeSlot]:
         """Format slots for API response"""
         formatted_slots = []
         
         for slot in slots:
-            start_time = slot["start_time"]
-            end_time = slot["end_time"]
+            start_iso = slot.start_time.isoformat()
             
             formatted_slots.append(TimeSlot(
-                start_time=start_time.isoformat(),
-                end_time=end_time.isoformat(),
-                duration_minutes=slot["duration_minutes"],
-                quality_score=slot["quality_score"],
-                day_of_week=start_time.strftime("%A"),
-                date_formatted=start_time.strftime("%Y-%m-%d"),
-                time_formatted=start_time.strftime("%H:%M"),
-                explanation=slot.get("explanation", "Available time slot")
+                start_time=start_iso,
+                end_time=slot.end_time.isoformat(),
+                duration_minutes=slot.duration_minutes,
+                quality_score=slot.quality_score,
+                day_of_week=slot.day_of_week,
+                date_formatted=start_iso[:10],
+                time_formatted=start_iso[11:16],
+                explanation=slot.explanation or "Available time slot"
             ))
         
         return formatted_slots
     
-    async def schedule_meeting(self, slot: Dict[str, Any], request: MeetingRequest) -> Tuple[bool, Optional[str]]:
+    async def schedule_meeting(self, slot: SlotCandidate, request: MeetingRequest) -> Tuple[bool, Optional[str]]:
         """Schedule the selected meeting"""
         try:
-            # Create meeting request
-            meeting_id = await self.meeting_service.create_meeting_request(
+            # Meeting, participants and both calendar blocks are written in one batch
+            meeting_id = await self.meeting_service.schedule_meeting(
                 initiator_id="bob",  # Pappu is represented as "bob" in the database
                 title=request.title,
                 description=f"Meeting scheduled via API",
-                duration_minutes=slot["duration_minutes"],
-                preferred_start_time=slot["start_time"],
-                preferred_end_time=slot["end_time"],
-                priority_level=7
-            )
-            
-            # Add participants
-            await self.meeting_service.add_meeting_participant(meeting_id, "bob", PAPPU_AGENT_ADDRESS)
-            await self.meeting_service.add_meeting_participant(meeting_id, "alice", ALICE_AGENT_ADDRESS)
-            
-            # Update status to scheduled
-            await self.meeting_service.update_meeting_status(meeting_id, "scheduled", slot["start_time"])
-            
-            # Add calendar blocks for both participants
-            await self.calendar_service.add_calendar_block(
-                "bob", 
-                f"Meeting: {request.title}", 
-                slot["start_time"], 
-                slot["end_time"], 
-                "busy", 
-                8, 
-                False
-            )
-            
-            await self.calendar_service.add_calendar_block(
-                "alice", 
-                f"Meeting: {request.title}", 
-                slot["start_time"], 
-                slot["end_time"], 
-                "busy", 
-                8, 
-                False
+                start_time=slot.start_time,
+                end_time=slot.end_time,
+                participants=[("bob", PAPPU_AGENT_ADDRESS), ("alice", ALICE_AGENT_ADDRESS)],
+                priority_level=7,
+                block_priority=8
             )
+            if meeting_id is None:
+                return False, None
             
+            self._evict_busy(("bob", "alice"), slot.start_time, slot.end_time)
             return True, meeting_id
             
         except Exception as e:
@@ -680,9 +1002,14 @@ negotiation = APINegotiation()
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database connection on startup"""
-    await negotiation.setup_database()
-    print("✅ Connected to SQLite database")
+    """Start connecting to the database; requests wait for it in wait_for_database"""
+    negotiation.start_setup()
+
+@app.middleware("http")
+async def wait_for_database(request: Request, call_next):
+    """Hold requests until the background database setup has finished"""
+    await negotiation.ready()
+    return await call_next(request)
 
 @app.get("/")
 async def root():
@@ -751,7 +1078,7 @@ async def get_user_calendar(user_id: str):
         if user_id not in ['bob', 'alice', 'charlie']:
             raise HTTPException(status_code=400, detail="User ID must be 'bob', 'alice', or 'charlie'")
         
-        blocks = await negotiation.calendar_service.get_user_calendar_blocks(user_id)
+        blocks = await negotiation._get_blocks(user_id)
         
         return {
             "success": True,
@@ -768,6 +1095,7 @@ async def negotiate_meeting(request: MeetingRequest):
     """
     Find available meeting slots based on user preferences
     """
+    slots_task = None
     try:
         # Send initial negotiation message
         if request.specific_agent:
@@ -802,6 +1130,13 @@ async def negotiate_meeting(request: MeetingRequest):
             }))
             raise HTTPException(status_code=400, detail=error_message)
         
+        # Start the slot search right away so it overlaps with the agent
+        # reasoning broadcast below instead of running after it
+        if request.specific_agent:
+            slots_task = asyncio.create_task(negotiation.find_single_agent_slots(request))
+        else:
+            slots_task = asyncio.create_task(negotiation.find_available_slots(request))
+        
         # Send detailed 3-agent communication messages with real calendar analysis
         if request.is_ai_agent_meeting:
             await manager.broadcast(json.dumps({
@@ -811,9 +1146,9 @@ async def negotiate_meeting(request: MeetingRequest):
             }))
             
             # Get actual calendar data for realistic reasoning
-            pappu_calendar = await negotiation.calendar_service.get_user_calendar_blocks("bob")
-            alice_calendar = await negotiation.calendar_service.get_user_calendar_blocks("alice") 
-            charlie_calendar = await negotiation.calendar_service.get_user_calendar_blocks("charlie")
+            pappu_calendar, alice_calendar, charlie_calendar = await asyncio.gather(
+                *(negotiation._get_blocks(user_id) for user_id in ("bob", "alice", "charlie"))
+            )
             
             # Alice's initial response with real calendar analysis
             alice_focus_blocks = [block for block in alice_calendar if 'focus' in str(block.get('block_type', '')).lower()]
@@ -832,7 +1167,6 @@ async def negotiate_meeting(request: MeetingRequest):
             }))
             
             # Simulate negotiation delay
-            import asyncio
             await asyncio.sleep(0.8)
             
             # Charlie's strategic analysis with real data
@@ -875,12 +1209,15 @@ async def negotiate_meeting(request: MeetingRequest):
             
             # Multi-agent discussion with real conflicts and agreements
             # Analyze the requested time against each agent's calendar
-            requested_time = datetime.strptime(f"{request.preferred_date} {request.preferred_time}", "%Y-%m-%d %H:%M")
+            requested_clock = _parse_time(request.preferred_time)
+            requested_time = _parse_date(request.preferred_date).replace(hour=requested_clock.hour, minute=requested_clock.minute)
             
             # Check for actual conflicts
-            alice_conflicts = await negotiation.calendar_service.check_time_conflict("alice", requested_time, requested_time + timedelta(minutes=request.duration_minutes))
-            charlie_conflicts = await negotiation.calendar_service.check_time_conflict("charlie", requested_time, requested_time + timedelta(minutes=request.duration_minutes))
-            pappu_conflicts = await negotiation.calendar_service.check_time_conflict("bob", requested_time, requested_time + timedelta(minutes=request.duration_minutes))
+            requested_end = requested_time + timedelta(minutes=request.duration_minutes)
+            alice_conflicts, charlie_conflicts, pappu_conflicts = await asyncio.gather(
+                *(negotiation._check_conflicts(user_id, requested_time, requested_end)
+                  for user_id in ("alice", "charlie", "bob"))
+            )
             
             # Alice's realistic evaluation
             alice_has_focus_conflict = any('focus' in str(conflict.get('block_type', '')).lower() for conflict in alice_conflicts)
@@ -941,15 +1278,12 @@ async def negotiate_meeting(request: MeetingRequest):
                 "timestamp": datetime.now().isoformat()
             }))
         
-        # Find available slots - handle specific agent or multi-agent
-        if request.specific_agent:
-            available_slots = await negotiation.find_single_agent_slots(request)
-        else:
-            available_slots = await negotiation.find_available_slots(request)
+        # Collect the slots found while the agents were reasoning
+        available_slots = await slots_task
         
         # Calculate search window
-        preferred_date = datetime.strptime(request.preferred_date, "%Y-%m-%d")
-        preferred_time = datetime.strptime(request.preferred_time, "%H:%M")
+        preferred_date = _parse_date(request.preferred_date)
+        preferred_time = _parse_time(request.preferred_time)
         preferred_datetime = preferred_date.replace(
             hour=preferred_time.hour, 
             minute=preferred_time.minute, 
@@ -958,15 +1292,7 @@ async def negotiate_meeting(request: MeetingRequest):
         )
         
         # Calculate search window based on meeting type
-        today = datetime.now().date()
-        db_end_date = datetime(2025, 10, 27).date()
-        
-        if request.is_ai_agent_meeting:
-            search_start = max(preferred_datetime - timedelta(days=5), datetime.combine(today, datetime.min.time()))
-            search_end = min(preferred_datetime + timedelta(days=5), datetime.combine(db_end_date, datetime.max.time()))
-        else:
-            search_start = max(preferred_datetime - timedelta(days=3), datetime.combine(today, datetime.min.time()))
-            search_end = min(preferred_datetime + timedelta(days=3), datetime.combine(db_end_date, datetime.max.time()))
+        search_start, search_end = negotiation._search_window(preferred_datetime, 5 if request.is_ai_agent_meeting else 3)
         
         # Handle case when no slots are found
         if not available_slots:
@@ -1045,6 +1371,8 @@ async def negotiate_meeting(request: MeetingRequest):
         )
         
     except Exception as e:
+        if slots_task is not None and not slots_task.done():
+            slots_task.cancel()
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/schedule", response_model=NegotiationResult)
@@ -1085,15 +1413,16 @@ async def schedule_meeting(request: MeetingRequest, slot_index: int = 0):
         formatted_slots = negotiation.format_slots_for_api(available_slots)
         selected_slot = formatted_slots[slot_index]
         
-        # Send scheduling message
-        await manager.broadcast(json.dumps({
-            "type": "scheduling_start",
-            "message": f"📅 Scheduling meeting '{request.title}' for {selected_slot.date_formatted} at {selected_slot.time_formatted}",
-            "timestamp": datetime.now().isoformat()
-        }))
-        
-        # Schedule the meeting
-        success, meeting_id = await negotiation.schedule_meeting(selected_slot_data, request)
+        # Send scheduling message and schedule the meeting together; the
+        # broadcast doesn't depend on the write, so neither waits on the other
+        _, (success, meeting_id) = await asyncio.gather(
+            manager.broadcast(json.dumps({
+                "type": "scheduling_start",
+                "message": f"📅 Scheduling meeting '{request.title}' for {selected_slot.date_formatted} at {selected_slot.time_formatted}",
+                "timestamp": datetime.now().isoformat()
+            })),
+            negotiation.schedule_meeting(selected_slot_data, request)
+        )
         
         if success:
             # Send success message
@@ -1253,6 +1582,8 @@ async def delete_calendar_block(block_id: str):
         )
         
         if result:
+            # The block's user and day aren't known here
+            negotiation._evict_all_busy()
             return {
                 "success": True,
                 "message": "Calendar block deleted successfully",
@@ -5,6 +5,7 @@ Creates database with real schema and mock data for agent schedules
 """
 import sqlite3
 import asyncio
+from itertools import chain
 from datetime import datetime, timedelta
 import sys
 import os
@@ -18,8 +19,9 @@ PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)  # Go up one level from backend_agent
 DATABASE_PATH = os.getenv("DATABASE_PATH", os.path.join(PROJECT_ROOT, "agentschedule.db"))
 
 # SQL schema adapted for SQLite
-SCHEMA_SQL = """
+SCHEMA_SQL_TABLES = """
 -- Core Users & Agent Management
+-- Small, text-keyed tables that are looked up by id are stored WITHOUT ROWID
 CREATE TABLE IF NOT EXISTS users (
     id TEXT PRIMARY KEY,
     name TEXT NOT NULL,
@@ -27,7 +29,7 @@ CREATE TABLE IF NOT EXISTS users (
     agent_address TEXT UNIQUE,
     timezone TEXT DEFAULT 'UTC',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+) WITHOUT ROWID;
 
 CREATE TABLE IF NOT EXISTS user_agents (
     id TEXT PRIMARY KEY,
@@ -37,7 +39,7 @@ CREATE TABLE IF NOT EXISTS user_agents (
     flexibility_score INTEGER DEFAULT 5,
     preferences TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+) WITHOUT ROWID;
 
 -- Internal Calendar System
 CREATE TABLE IF NOT EXISTS calendar_blocks (
@@ -50,7 +52,7 @@ CREATE TABLE IF NOT EXISTS calendar_blocks (
     priority INTEGER DEFAULT 5,
     is_moveable BOOLEAN DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+) WITHOUT ROWID;
 
 -- Meeting Management
 CREATE TABLE IF NOT EXISTS meeting_requests (
@@ -76,7 +78,7 @@ CREATE TABLE IF NOT EXISTS meeting_participants (
     status TEXT DEFAULT 'pending',
     constraints TEXT,
     UNIQUE(meeting_request_id, user_id)
-);
+) WITHOUT ROWID;
 
 -- Agent Negotiation Tracking
 CREATE TABLE IF NOT EXISTS negotiation_sessions (
@@ -114,207 +116,183 @@ CREATE TABLE IF NOT EXISTS voice_sessions (
 );
 """
 
-def generate_alice_daily_schedule(date, day_offset):
-    """Generate realistic daily schedule for Alice (focused software engineer)"""
-    blocks = []
-    base_id = f"alice_{day_offset}_"
-    
-    # Alice's typical schedule patterns
-    morning_focus_start = random.choice([8, 9, 9, 9])  # Usually 9 AM
-    morning_focus_duration = random.choice([2, 3, 3, 4])  # 2-4 hours
-    
-    # Morning focus time (high priority, not moveable)
-    blocks.append((
-        f"{base_id}1", "alice", "Deep Work Session", 
-        date.replace(hour=morning_focus_start, minute=0, second=0, microsecond=0),
-        date.replace(hour=morning_focus_start + morning_focus_duration, minute=0, second=0, microsecond=0),
-        "focus_time", 9, False
-    ))
-    
-    # Lunch (fixed time)
-    lunch_start = random.choice([12, 12, 13])  # Usually 12-1 PM
-    blocks.append((
-        f"{base_id}2", "alice", "Lunch Break",
-        date.replace(hour=lunch_start, minute=0, second=0, microsecond=0),
-        date.replace(hour=lunch_start + 1, minute=0, second=0, microsecond=0),
-        "busy", 6, False
-    ))
-    
-    # Afternoon work (varies by day)
-    afternoon_start = lunch_start + 1
-    if random.random() < 0.3:  # 30% chance of afternoon focus time
-        blocks.append((
-            f"{base_id}3", "alice", "Afternoon Focus",
-            date.replace(hour=afternoon_start, minute=0, second=0, microsecond=0),
-            date.replace(hour=afternoon_start + 2, minute=0, second=0, microsecond=0),
-            "focus_time", 8, False
-        ))
-        afternoon_start += 2
-    
-    # Team meetings (varies)
-    if random.random() < 0.4:  # 40% chance of team meeting
-        meeting_duration = random.choice([30, 45, 60])
-        meeting_end_hour = afternoon_start + (meeting_duration // 60)
-        meeting_end_minute = meeting_duration % 60
-        blocks.append((
-            f"{base_id}4", "alice", "Team Meeting",
-            date.replace(hour=afternoon_start, minute=0, second=0, microsecond=0),
-            date.replace(hour=meeting_end_hour, minute=meeting_end_minute, second=0, microsecond=0),
-            "busy", 7, False
-        ))
-        afternoon_start += 1
-    
-    # Code review or client call
-    if random.random() < 0.3:  # 30% chance
-        blocks.append((
-            f"{base_id}5", "alice", "Code Review",
-            date.replace(hour=afternoon_start, minute=0, second=0, microsecond=0),
-            date.replace(hour=afternoon_start + 1, minute=0, second=0, microsecond=0),
-            "busy", 6, False
-        ))
-    
-    return blocks
+# Indexes are built after the bulk insert so rows aren't indexed one at a time
+SCHEMA_SQL_INDEXES = """
+-- Per-user time-range lookups and per-meeting/session joins
+CREATE INDEX IF NOT EXISTS idx_blocks_user_time ON calendar_blocks(user_id, start_time, end_time);
+CREATE INDEX IF NOT EXISTS idx_participants_meeting ON meeting_participants(meeting_request_id);
+CREATE INDEX IF NOT EXISTS idx_negmsg_session_round ON negotiation_messages(negotiation_session_id, round_number);
+"""
+
+# Split once at import so setup can run each statement inside its own transaction
+# (executescript always commits first)
+SCHEMA_TABLE_STATEMENTS = [stmt.strip() for stmt in SCHEMA_SQL_TABLES.split(";") if stmt.strip()]
+SCHEMA_INDEX_STATEMENTS = [stmt.strip() for stmt in SCHEMA_SQL_INDEXES.split(";") if stmt.strip()]
+
+USER_COLUMNS = ("id", "name", "email", "agent_address")
+USERS_DATA = [
+    ("alice", "Alice Johnson", "alice@example.com", "agent1qfy2twzrw6ne43eufnzadxj0s3xpzlwd7vrgde5yrq46043kp8hpzpx6x76"),
+    ("bob", "Bob Smith", "bob@example.com", "agent1qfy2twzrw6ne43eufnzadxj0s3xpzlwd7vrgde5yrq46043kp8hpzpx6x75"),
+    ("charlie", "Charlie Wilson", "charlie@example.com", "agent1qge95a5nqwjqgg0td05y9866jtjac7zf6g3908qjs330lm07kz8s799w9s9")
+]
 
-def generate_bob_daily_schedule(date, day_offset):
-    """Generate realistic daily schedule for Bob (collaborative project manager)"""
+BLOCK_COLUMNS = ("id", "user_id", "title", "start_time", "end_time", "block_type", "priority", "is_moveable")
+
+def chunked_insert(cursor, table, cols, rows, max_params=450):
+    """Insert rows with multi-row VALUES statements, staying under SQLite's bound-parameter limit"""
+    rows_per_stmt = max(1, max_params // len(cols))
+    row_placeholder = "(" + ", ".join(["?"] * len(cols)) + ")"
+    for i in range(0, len(rows), rows_per_stmt):
+        chunk = rows[i:i + rows_per_stmt]
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(cols)}) VALUES " + ", ".join([row_placeholder] * len(chunk)),
+            list(chain.from_iterable(chunk))
+        )
+
+def block_time(day0, minutes):
+    """Timestamp text for a time on the given day, so sqlite3 binds it without the datetime adapter"""
+    return (day0 + timedelta(minutes=minutes)).isoformat(sep=" ")
+
+def with_block_ids(user_id, day_offset, blocks):
+    """Prefix each generated block with its id, numbered within the day"""
+    return [(f"{user_id}_{day_offset}_{i}",) + block for i, block in enumerate(blocks, 1)]
+
+def draw_daily_choices(days):
+    """Pre-draw the choices every workday makes, one batch per decision, indexed by day offset"""
+    return {
+        "alice_focus_start": random.choices([8, 9, 9, 9], k=days),
+        "alice_focus_minutes": random.choices([120, 180, 180, 240], k=days),
+        "alice_lunch_start": random.choices([12, 12, 13], k=days),
+        "bob_morning_start": random.choices([8, 9, 9], k=days),
+        "bob_lunch_start": random.choices([12, 12, 13], k=days),
+        "bob_meeting_count": random.choices([1, 2, 3], k=days),
+    }
+
+# Persona schedules as data. Each template places one block (or "repeat" blocks)
+# and is read by generate_daily_schedule:
+#   start         hour the block starts at (int, or a key into the daily choices);
+#                 without it the block starts where the previous one left off
+#   latest_start  skip the block if it would start at or after this hour
+#   probability   chance the block happens at all
+#   title         fixed, or a list to pick from
+#   minutes       fixed, a list to pick from, or a key into the daily choices
+#   until         fixed end hour instead of a duration
+#   priority      fixed, or an inclusive (low, high) range
+#   advance       where the next block starts: "ceil_hour" is the first full hour
+#                 at or after this block ends, "next_hour" the one after that
+
+# Alice: focused software engineer, protective of deep work
+ALICE_TEMPLATES = (
+    {"title": "Deep Work Session", "type": "focus_time", "priority": 9, "moveable": False,
+     "start": "alice_focus_start", "minutes": "alice_focus_minutes"},
+    {"title": "Lunch Break", "type": "busy", "priority": 6, "moveable": False,
+     "start": "alice_lunch_start", "minutes": 60, "advance": "ceil_hour"},
+    {"title": "Afternoon Focus", "type": "focus_time", "priority": 8, "moveable": False,
+     "probability": 0.3, "minutes": 120, "advance": "ceil_hour"},
+    {"title": "Team Meeting", "type": "busy", "priority": 7, "moveable": False,
+     "probability": 0.4, "minutes": [30, 45, 60], "advance": "ceil_hour"},
+    {"title": "Code Review", "type": "busy", "priority": 6, "moveable": False,
+     "probability": 0.3, "minutes": 60},
+)
+
+# Bob: collaborative project manager, more meetings and more flexible time
+BOB_TEMPLATES = (
+    {"title": "Daily Standup", "type": "busy", "priority": 7, "moveable": False,
+     "start": "bob_morning_start", "probability": 0.6, "minutes": 30, "advance": "ceil_hour"},
+    {"title": "Flexible Work Time", "type": "flexible", "priority": 3, "moveable": True,
+     "minutes": 120},
+    {"title": "Lunch", "type": "busy", "priority": 5, "moveable": False,
+     "start": "bob_lunch_start", "minutes": 60, "advance": "ceil_hour"},
+    {"title": ["Client Call", "Project Review", "Team Sync", "Stakeholder Meeting", "Planning Session"],
+     "type": "busy", "priority": (6, 8), "moveable": False,
+     "repeat": "bob_meeting_count", "minutes": [30, 45, 60, 90], "advance": "next_hour"},
+    {"title": "End of Day Tasks", "type": "flexible", "priority": 2, "moveable": True,
+     "latest_start": 17, "until": 17},
+)
+
+# Charlie: strategic operations manager, batches meetings and guards lunch
+CHARLIE_TEMPLATES = (
+    {"title": "Strategic Planning & Review", "type": "focus_time", "priority": 8, "moveable": False,
+     "start": 9, "minutes": 90},
+    {"title": ["Operations Review", "Team Coordination", "Process Optimization", "Resource Planning", "Performance Analysis"],
+     "type": "busy", "priority": 7, "moveable": False,
+     "start": 11, "probability": 0.7, "minutes": 60},
+    {"title": "Lunch & Strategic Thinking", "type": "busy", "priority": 6, "moveable": False,
+     "start": 12, "minutes": 60},
+    {"title": ["Process Improvement", "Team Development", "Strategic Analysis", "Operational Excellence"],
+     "type": "focus_time", "priority": 7, "moveable": False,
+     "start": 13, "probability": 0.8, "minutes": [60, 90, 120], "advance": "ceil_hour"},
+    {"title": ["Cross-team Sync", "Stakeholder Update", "Innovation Session", "Mentoring"],
+     "type": "flexible", "priority": 5, "moveable": True,  # Charlie's only flexible block
+     "latest_start": 16, "probability": 0.6, "minutes": 60},
+    {"title": "Daily Wrap-up & Tomorrow's Planning", "type": "focus_time", "priority": 6, "moveable": False,
+     "start": 16, "probability": 0.4, "minutes": 30},
+)
+
+def generate_daily_schedule(date, day_offset, user_id, templates, daily):
+    """Generate one day's calendar blocks for a persona from its schedule templates"""
     blocks = []
-    base_id = f"bob_{day_offset}_"
-    
-    # Bob's typical schedule patterns (more meetings, more flexible)
-    morning_start = random.choice([8, 9, 9])  # Usually 9 AM
-    
-    # Morning planning/standup
-    if random.random() < 0.6:  # 60% chance of morning meeting
-        blocks.append((
-            f"{base_id}1", "bob", "Daily Standup",
-            date.replace(hour=morning_start, minute=0, second=0, microsecond=0),
-            date.replace(hour=morning_start, minute=30, second=0, microsecond=0),
-            "busy", 7, False
-        ))
-        morning_start += 1
-    
-    # Flexible work time (moveable)
-    blocks.append((
-        f"{base_id}2", "bob", "Flexible Work Time",
-        date.replace(hour=morning_start, minute=0, second=0, microsecond=0),
-        date.replace(hour=morning_start + 2, minute=0, second=0, microsecond=0),
-        "flexible", 3, True
-    ))
+    day0 = date.replace(hour=0, minute=0, second=0, microsecond=0)  # Block times are offsets from midnight
+    cursor = 0  # Minutes after midnight where the next chained block starts
     
-    # Lunch
-    lunch_start = random.choice([12, 12, 13])
-    blocks.append((
-        f"{base_id}3", "bob", "Lunch",
-        date.replace(hour=lunch_start, minute=0, second=0, microsecond=0),
-        date.replace(hour=lunch_start + 1, minute=0, second=0, microsecond=0),
-        "busy", 5, False
-    ))
-    
-    # Afternoon meetings (Bob has more meetings)
-    afternoon_start = lunch_start + 1
-    meeting_count = random.randint(1, 3)  # 1-3 afternoon meetings
-    
-    for i in range(meeting_count):
-        meeting_types = ["Client Call", "Project Review", "Team Sync", "Stakeholder Meeting", "Planning Session"]
-        meeting_type = random.choice(meeting_types)
-        meeting_duration = random.choice([30, 45, 60, 90])
+    for template in templates:
+        start = template.get("start")
+        if start is not None:
+            cursor = 60 * (daily[start][day_offset] if isinstance(start, str) else start)
         
-        meeting_end_hour = afternoon_start + (meeting_duration // 60)
-        meeting_end_minute = meeting_duration % 60
-        blocks.append((
-            f"{base_id}{4+i}", "bob", meeting_type,
-            date.replace(hour=afternoon_start, minute=0, second=0, microsecond=0),
-            date.replace(hour=meeting_end_hour, minute=meeting_end_minute, second=0, microsecond=0),
-            "busy", random.randint(6, 8), False
-        ))
+        repeat = template.get("repeat", 1)
+        if isinstance(repeat, str):
+            repeat = daily[repeat][day_offset]
         
-        afternoon_start += (meeting_duration // 60) + 1
-    
-    # End of day flexible time
-    if afternoon_start < 17:
-        blocks.append((
-            f"{base_id}{4+meeting_count}", "bob", "End of Day Tasks",
-            date.replace(hour=afternoon_start, minute=0, second=0, microsecond=0),
-            date.replace(hour=17, minute=0, second=0, microsecond=0),
-            "flexible", 2, True
-        ))
+        for _ in range(repeat):
+            if cursor >= 60 * template.get("latest_start", 24):
+                continue
+            if "probability" in template and random.random() >= template["probability"]:
+                continue
+            
+            title = template["title"]
+            if isinstance(title, list):
+                title = random.choice(title)
+            minutes = template.get("minutes")
+            if isinstance(minutes, list):
+                minutes = random.choice(minutes)
+            elif isinstance(minutes, str):
+                minutes = daily[minutes][day_offset]
+            priority = template["priority"]
+            if isinstance(priority, tuple):
+                priority = random.randint(*priority)
+            
+            end = 60 * template["until"] if "until" in template else cursor + minutes
+            blocks.append((
+                user_id, title, block_time(day0, cursor), block_time(day0, end),
+                template["type"], priority, template["moveable"]
+            ))
+            
+            advance = template.get("advance")
+            if advance == "ceil_hour":
+                cursor = -(-end // 60) * 60
+            elif advance == "next_hour":
+                cursor = (end // 60 + 1) * 60
     
     return blocks
 
-def generate_charlie_daily_schedule(date, day_offset):
-    """Generate realistic daily schedule for Charlie (strategic operations manager)"""
-    blocks = []
-    base_id = f"charlie_{day_offset}_"
-    
-    # Charlie's strategic schedule patterns - efficiency focused
-    morning_start = 9  # Charlie always starts at 9 AM for consistency
-    
-    # Strategic planning block (Charlie's signature morning routine)
-    blocks.append((
-        f"{base_id}1", "charlie", "Strategic Planning & Review",
-        date.replace(hour=morning_start, minute=0, second=0, microsecond=0),
-        date.replace(hour=morning_start + 1, minute=30, second=0, microsecond=0),
-        "focus_time", 8, False
-    ))
-    
-    # Operational meetings (Charlie batches meetings efficiently)
-    meeting_start = morning_start + 2  # 11 AM
-    if random.random() < 0.7:  # 70% chance of operational meetings
-        meeting_types = ["Operations Review", "Team Coordination", "Process Optimization", "Resource Planning", "Performance Analysis"]
-        meeting_type = random.choice(meeting_types)
-        blocks.append((
-            f"{base_id}2", "charlie", meeting_type,
-            date.replace(hour=meeting_start, minute=0, second=0, microsecond=0),
-            date.replace(hour=meeting_start + 1, minute=0, second=0, microsecond=0),
-            "busy", 7, False
-        ))
-    
-    # Protected lunch hour (Charlie is strict about lunch for productivity)
-    blocks.append((
-        f"{base_id}3", "charlie", "Lunch & Strategic Thinking",
-        date.replace(hour=12, minute=0, second=0, microsecond=0),
-        date.replace(hour=13, minute=0, second=0, microsecond=0),
-        "busy", 6, False
-    ))
-    
-    # Afternoon efficiency block
-    afternoon_start = 13
-    if random.random() < 0.8:  # 80% chance of afternoon work
-        afternoon_types = ["Process Improvement", "Team Development", "Strategic Analysis", "Operational Excellence"]
-        afternoon_type = random.choice(afternoon_types)
-        duration = random.choice([1, 1.5, 2])  # 1-2 hours
-        end_hour = afternoon_start + int(duration)
-        end_minute = int((duration % 1) * 60)
-        
-        blocks.append((
-            f"{base_id}4", "charlie", afternoon_type,
-            date.replace(hour=afternoon_start, minute=0, second=0, microsecond=0),
-            date.replace(hour=end_hour, minute=end_minute, second=0, microsecond=0),
-            "focus_time", 7, False
-        ))
-        afternoon_start = end_hour + (1 if end_minute > 0 else 0)
-    
-    # Late afternoon collaboration (Charlie's flexible time)
-    if afternoon_start < 16 and random.random() < 0.6:  # 60% chance if time allows
-        collaboration_types = ["Cross-team Sync", "Stakeholder Update", "Innovation Session", "Mentoring"]
-        collaboration_type = random.choice(collaboration_types)
-        blocks.append((
-            f"{base_id}5", "charlie", collaboration_type,
-            date.replace(hour=afternoon_start, minute=0, second=0, microsecond=0),
-            date.replace(hour=min(afternoon_start + 1, 16), minute=0, second=0, microsecond=0),
-            "flexible", 5, True  # This is Charlie's only flexible block
-        ))
-    
-    # End-of-day wrap-up (Charlie likes to end efficiently)
-    if random.random() < 0.4:  # 40% chance of wrap-up session
-        blocks.append((
-            f"{base_id}6", "charlie", "Daily Wrap-up & Tomorrow's Planning",
-            date.replace(hour=16, minute=0, second=0, microsecond=0),
-            date.replace(hour=16, minute=30, second=0, microsecond=0),
-            "focus_time", 6, False
-        ))
-    
-    return blocks
+_CONN = None
+
+def get_conn():
+    """Return the script's shared connection, opening and configuring it on first use"""
+    global _CONN
+    if _CONN is None:
+        # detect_types=0 keeps TIMESTAMP columns as plain text on read: don't opt into
+        # PARSE_DECLTYPES, which runs a Python converter for every timestamp fetched.
+        # isolation_level=None because transactions are managed explicitly.
+        _CONN = sqlite3.connect(DATABASE_PATH, detect_types=0, isolation_level=None)
+        # WAL with NORMAL sync needs one fsync per checkpoint instead of two per commit;
+        # keep temp structures in memory and give the bulk load a 64MB page cache
+        _CONN.execute("PRAGMA journal_mode=WAL")
+        _CONN.execute("PRAGMA synchronous=NORMAL")
+        _CONN.execute("PRAGMA temp_store=MEMORY")
+        _CONN.execute("PRAGMA cache_size=-65536")
+    return _CONN
 
 def setup_database():
     """Setup the SQLite database with schema and mock data"""
@@ -322,32 +300,25 @@ def setup_database():
     
     try:
         # Connect to SQLite database
-        conn = sqlite3.connect(DATABASE_PATH)
+        conn = get_conn()
         cursor = conn.cursor()
         print("✅ Connected to SQLite database")
         
-        # Create schema
-        cursor.executescript(SCHEMA_SQL)
-        print("✅ Database schema created")
+        # Create the schema and load all data in one write transaction
+        cursor.execute("BEGIN IMMEDIATE")
         
-        # Clear existing data
-        cursor.execute("DELETE FROM calendar_blocks")
-        cursor.execute("DELETE FROM users")
+        # Clear existing data: dropping the reloaded tables frees their pages at once
+        # instead of deleting (and journaling) row by row; meeting history is kept
+        cursor.execute("DROP TABLE IF EXISTS calendar_blocks")
+        cursor.execute("DROP TABLE IF EXISTS users")
         print("✅ Cleared existing data")
         
-        # Insert users
-        users_data = [
-            ("alice", "Alice Johnson", "alice@example.com", "agent1qfy2twzrw6ne43eufnzadxj0s3xpzlwd7vrgde5yrq46043kp8hpzpx6x76"),
-            ("bob", "Bob Smith", "bob@example.com", "agent1qfy2twzrw6ne43eufnzadxj0s3xpzlwd7vrgde5yrq46043kp8hpzpx6x75"),
-            ("charlie", "Charlie Wilson", "charlie@example.com", "agent1qge95a5nqwjqgg0td05y9866jtjac7zf6g3908qjs330lm07kz8s799w9s9")
-        ]
-        
-        for user_id, name, email, agent_address in users_data:
-            cursor.execute("""
-                INSERT INTO users (id, name, email, agent_address) 
-                VALUES (?, ?, ?, ?)
-            """, (user_id, name, email, agent_address))
+        for statement in SCHEMA_TABLE_STATEMENTS:
+            cursor.execute(statement)
+        print("✅ Database schema created")
         
+        # Insert users
+        chunked_insert(cursor, "users", USER_COLUMNS, USERS_DATA)
         print("✅ Users created")
         
         # Create realistic schedules for all three users for the next month
@@ -357,55 +328,44 @@ def setup_database():
         charlie_calendar = []
         
         # Generate realistic schedules for 31 days (exactly 1 month from 2025-09-27 to 2025-10-27)
-        for day in range(31):
+        daily = draw_daily_choices(31)
+        
+        # Work schedules only cover weekdays: pick the Monday-Friday offsets up front
+        first_weekday = now.weekday()  # 0=Monday, 6=Sunday
+        workdays = [day for day in range(31) if (first_weekday + day) % 7 < 5]
+        for day in workdays:
             current_date = now + timedelta(days=day)
-            day_of_week = current_date.weekday()  # 0=Monday, 6=Sunday
-
-            # Skip weekends for work schedules
-            if day_of_week >= 5:  # Saturday or Sunday
-                continue
-
+            
             # Alice's schedule (focused personality - software engineer)
-            alice_blocks = generate_alice_daily_schedule(current_date, day)
-            alice_calendar.extend(alice_blocks)
+            alice_calendar.extend(with_block_ids("alice", day, generate_daily_schedule(current_date, day, "alice", ALICE_TEMPLATES, daily)))
             
             # Bob's schedule (collaborative personality - project manager)
-            bob_blocks = generate_bob_daily_schedule(current_date, day)
-            bob_calendar.extend(bob_blocks)
+            bob_calendar.extend(with_block_ids("bob", day, generate_daily_schedule(current_date, day, "bob", BOB_TEMPLATES, daily)))
             
             # Charlie's schedule (strategic personality - operations manager)
-            charlie_blocks = generate_charlie_daily_schedule(current_date, day)
-            charlie_calendar.extend(charlie_blocks)
+            charlie_calendar.extend(with_block_ids("charlie", day, generate_daily_schedule(current_date, day, "charlie", CHARLIE_TEMPLATES, daily)))
         
         # Insert Alice's calendar blocks
-        for block_id, user_id, title, start_time, end_time, block_type, priority, is_moveable in alice_calendar:
-            cursor.execute("""
-                INSERT INTO calendar_blocks (id, user_id, title, start_time, end_time, block_type, priority, is_moveable)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (block_id, user_id, title, start_time, end_time, block_type, priority, is_moveable))
+        chunked_insert(cursor, "calendar_blocks", BLOCK_COLUMNS, alice_calendar)
         
         print(f"✅ Alice's calendar created ({len(alice_calendar)} blocks) - focused personality")
         
         # Insert Bob's calendar blocks
-        for block_id, user_id, title, start_time, end_time, block_type, priority, is_moveable in bob_calendar:
-            cursor.execute("""
-                INSERT INTO calendar_blocks (id, user_id, title, start_time, end_time, block_type, priority, is_moveable)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (block_id, user_id, title, start_time, end_time, block_type, priority, is_moveable))
+        chunked_insert(cursor, "calendar_blocks", BLOCK_COLUMNS, bob_calendar)
         
         print(f"✅ Bob's calendar created ({len(bob_calendar)} blocks) - collaborative personality")
         
         # Insert Charlie's calendar blocks
-        for block_id, user_id, title, start_time, end_time, block_type, priority, is_moveable in charlie_calendar:
-            cursor.execute("""
-                INSERT INTO calendar_blocks (id, user_id, title, start_time, end_time, block_type, priority, is_moveable)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (block_id, user_id, title, start_time, end_time, block_type, priority, is_moveable))
+        chunked_insert(cursor, "calendar_blocks", BLOCK_COLUMNS, charlie_calendar)
         
         print(f"✅ Charlie's calendar created ({len(charlie_calendar)} blocks) - strategic personality")
         
-        conn.commit()
-        conn.close()
+        # Build indexes over the loaded rows in the same transaction
+        for statement in SCHEMA_INDEX_STATEMENTS:
+            cursor.execute(statement)
+        print("✅ Indexes created")
+        
+        cursor.execute("COMMIT")
         print("✅ Database setup completed successfully!")
         
         # Print summary
@@ -421,22 +381,29 @@ def setup_database():
         
     except Exception as e:
         print(f"❌ Database setup failed: {e}")
+        if _CONN is not None and _CONN.in_transaction:
+            _CONN.rollback()
         return False
 
+def format_calendar_rows(rows):
+    """Render calendar rows as one block of text so they are written in a single call"""
+    return "".join(
+        f"   {row[1][:16]} - {row[2][:16]}: {row[0]} ({row[3]}, Priority: {row[4]}, {'Moveable' if row[5] else 'Fixed'})\n"
+        for row in rows
+    )
+
 def show_database_contents():
     """Show the contents of the database"""
     print("\n🔍 Database Contents:")
     print("=" * 40)
     
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        cursor = get_conn().cursor()
         
         # Show users
         print("\n👤 Users:")
         cursor.execute("SELECT id, name, email, agent_address FROM users")
-        for row in cursor.fetchall():
-            print(f"   {row[0]}: {row[1]} ({row[2]}) -> {row[3][:20]}...")
+        sys.stdout.write("".join(f"   {row[0]}: {row[1]} ({row[2]}) -> {row[3][:20]}...\n" for row in cursor))
         
         # Show Alice's calendar
         print("\n📅 Alice's Calendar:")
@@ -445,9 +412,7 @@ def show_database_contents():
             FROM calendar_blocks WHERE user_id = 'alice' 
             ORDER BY start_time
         """)
-        for row in cursor.fetchall():
-            moveable = "Moveable" if row[5] else "Fixed"
-            print(f"   {row[1][:16]} - {row[2][:16]}: {row[0]} ({row[3]}, Priority: {row[4]}, {moveable})")
+        sys.stdout.write(format_calendar_rows(cursor))
         
         # Show Bob's calendar
         print("\n📅 Bob's Calendar:")
@@ -456,11 +421,7 @@ def show_database_contents():
             FROM calendar_blocks WHERE user_id = 'bob' 
             ORDER BY start_time
         """)
-        for row in cursor.fetchall():
-            moveable = "Moveable" if row[5] else "Fixed"
-            print(f"   {row[1][:16]} - {row[2][:16]}: {row[0]} ({row[3]}, Priority: {row[4]}, {moveable})")
-        
-        conn.close()
+        sys.stdout.write(format_calendar_rows(cursor))
         
     except Exception as e:
         print(f"❌ Error reading database: {e}")